@@ -7,15 +7,20 @@ import re
 import secrets
 import hashlib
 import hmac
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from functools import wraps
-from urllib.parse import urlparse
+from functools import lru_cache, wraps
+from typing import NamedTuple, Optional
 
 from flask import Flask, render_template, request, redirect, url_for, jsonify, send_from_directory, session, abort
-from db import get_database, VALID_STATUSES, VALID_COMMONS_STATUSES
-from wikipedia import fetch_career_data
+from jinja2 import FileSystemBytecodeCache
+from db import get_database, STATUS_CHOICES, VALID_STATUSES, COMMONS_STATUS_CHOICES, VALID_COMMONS_STATUSES
+from wikipedia import fetch_career_data, invalidate_career_data
 from openverse import search_images, get_image_detail, generate_attribution
-from commons import fetch_category_files, fetch_category_members, fetch_subcategories, fetch_category_info
+from commons import fetch_category_members, fetch_category_overview
 
 app = Flask(__name__)
 
@@ -31,34 +36,41 @@ app.config.update(
     SESSION_COOKIE_HTTPONLY=True,
     SESSION_COOKIE_SAMESITE='Lax',
     PERMANENT_SESSION_LIFETIME=timedelta(hours=4),
+    # Warm the Wikipedia cache for the career after the one being viewed
+    PREFETCH_NEXT_CAREER=True,
 )
 
+# Fire-and-forget background fetches; results land in the wikipedia.py disk cache
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='prefetch')
+
 
 # =============================================================================
 # SECURITY: Input Validation
 # =============================================================================
 
 # Wikidata ID format: Q followed by digits (e.g., Q42, Q123456)
-WIKIDATA_ID_PATTERN = re.compile(r'^Q\d+$')
+# Use with fullmatch(); re.ASCII keeps \d from matching non-ASCII digits
+WIKIDATA_ID_PATTERN = re.compile(r'Q\d+', re.ASCII)
 
-# Openverse image ID format: UUID
-UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+# Openverse image ID format: UUID (use with fullmatch())
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
 
 
 def is_valid_wikidata_id(wikidata_id: str) -> bool:
     """Validate that a string is a valid Wikidata Q-ID."""
-    return bool(wikidata_id and WIKIDATA_ID_PATTERN.match(wikidata_id))
+    return bool(wikidata_id and WIKIDATA_ID_PATTERN.fullmatch(wikidata_id))
+
+
+@lru_cache(maxsize=8)
+def _url_pattern(allowed_schemes: tuple) -> re.Pattern:
+    """Compile a scheme://netloc matcher for the given schemes (one regex pass, no urlparse)."""
+    schemes = '|'.join(re.escape(scheme) for scheme in allowed_schemes)
+    return re.compile(rf'^(?:{schemes})://[^/\s?#]+(?:[/?#]|\Z)', re.IGNORECASE)
 
 
 def is_valid_url(url: str, allowed_schemes: tuple = ('http', 'https')) -> bool:
     """Validate that a string is a valid URL with allowed scheme."""
-    if not url:
-        return False
-    try:
-        parsed = urlparse(url)
-        return parsed.scheme in allowed_schemes and bool(parsed.netloc)
-    except Exception:
-        return False
+    return bool(url and _url_pattern(tuple(allowed_schemes)).match(url))
 
 
 def sanitize_search_query(query: str) -> str:
@@ -72,12 +84,41 @@ def sanitize_search_query(query: str) -> str:
     return query
 
 
+class StatusUpdate(NamedTuple):
+    """A validated review-status form submission."""
+    status: str
+    notes: str
+    reviewed_by: str
+
+
+def parse_status_update(form, field: str = 'status', valid: frozenset = VALID_STATUSES,
+                        reviewed_by: str = None) -> Optional[StatusUpdate]:
+    """
+    Validate a status form, returning None if the status is missing or invalid.
+
+    If reviewed_by is not given it is read from the form (default 'anonymous').
+    """
+    status = form.get(field)
+    if status not in valid:
+        return None
+    # SECURITY: Limit free-text field lengths
+    notes = form.get('notes', '')[:2000]
+    if reviewed_by is None:
+        reviewed_by = form.get('reviewed_by', 'anonymous')[:100]
+    return StatusUpdate(status, notes, reviewed_by)
+
+
 # =============================================================================
 # SECURITY: CSRF Protection
 # =============================================================================
 
 def generate_csrf_token():
-    """Generate a CSRF token for the current session."""
+    """
+    Generate a CSRF token for the current session.
+
+    Only called from templates that render a POST form, so plain page views
+    never create (and Set-Cookie) a session.
+    """
     if '_csrf_token' not in session:
         session['_csrf_token'] = secrets.token_hex(32)
     return session['_csrf_token']
@@ -86,10 +127,13 @@ def generate_csrf_token():
 def validate_csrf_token():
     """Validate the CSRF token from the form matches the session."""
     token = request.form.get('_csrf_token')
+    if not token:
+        return False
     session_token = session.get('_csrf_token')
-    if not token or not session_token:
+    if not session_token:
         return False
-    return hmac.compare_digest(token, session_token)
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str input
+    return hmac.compare_digest(token.encode(), session_token.encode())
 
 
 def csrf_protect(f):
@@ -108,20 +152,34 @@ app.jinja_env.globals['csrf_token'] = generate_csrf_token
 
 
 # =============================================================================
-# SECURITY: Rate Limiting (simple in-memory implementation)
+# Template compilation
 # =============================================================================
 
-from collections import defaultdict
-import time
-import threading
+# Outside debug mode templates never change at runtime: skip the per-render
+# mtime check, share compiled bytecode between workers via the temp dir, and
+# compile everything at startup rather than on each worker's first request.
+if os.environ.get('FLASK_DEBUG', '0') != '1':
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    for template_name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template_name)
+
+
+# =============================================================================
+# SECURITY: Rate Limiting (simple in-memory implementation)
+# =============================================================================
 
 class RateLimiter:
     """Simple in-memory rate limiter. For production, consider Redis-based solution."""
 
-    def __init__(self, requests_per_minute: int = 60):
+    def __init__(self, requests_per_minute: int = 60, max_keys: int = 100_000):
         self.requests_per_minute = requests_per_minute
         self.window_size = 60  # seconds
-        self.requests = defaultdict(list)
+        # Per-key timestamps of the last `requests_per_minute` requests, in LRU order
+        # so the least recently seen client is dropped once `max_keys` is reached
+        self.max_keys = max_keys
+        self.requests = OrderedDict()
         self._lock = threading.Lock()
 
     def is_allowed(self, key: str) -> bool:
@@ -130,26 +188,29 @@ class RateLimiter:
         window_start = now - self.window_size
 
         with self._lock:
-            # Clean old entries
-            self.requests[key] = [t for t in self.requests[key] if t > window_start]
-
-            if len(self.requests[key]) >= self.requests_per_minute:
+            timestamps = self.requests.get(key)
+            if timestamps is None:
+                timestamps = self.requests[key] = deque(maxlen=self.requests_per_minute)
+                if len(self.requests) > self.max_keys:
+                    self.requests.popitem(last=False)
+            else:
+                self.requests.move_to_end(key)
+
+            # Only the last N requests are kept, so the limit is hit exactly
+            # when all N of them fall inside the window
+            if len(timestamps) >= self.requests_per_minute and timestamps[0] > window_start:
                 return False
 
-            self.requests[key].append(now)
+            timestamps.append(now)
             return True
 
     def cleanup(self):
-        """Remove stale entries to prevent memory growth."""
-        now = time.time()
-        window_start = now - self.window_size
+        """Remove clients with no requests inside the current window."""
+        window_start = time.time() - self.window_size
         with self._lock:
-            keys_to_remove = []
-            for key, timestamps in self.requests.items():
-                self.requests[key] = [t for t in timestamps if t > window_start]
-                if not self.requests[key]:
-                    keys_to_remove.append(key)
-            for key in keys_to_remove:
+            stale = [key for key, timestamps in self.requests.items()
+                     if not timestamps or timestamps[-1] <= window_start]
+            for key in stale:
                 del self.requests[key]
 
 
@@ -183,78 +244,112 @@ def rate_limit(limiter: RateLimiter):
 # SECURITY: Response Headers
 # =============================================================================
 
-@app.after_request
-def add_security_headers(response):
-    """Add security headers to all responses."""
+# Content Security Policy - restrict script sources
+# Note: 'unsafe-inline' needed for inline scripts; consider moving to external files
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "img-src 'self' https://*.wikimedia.org https://*.wikipedia.org https://api.openverse.org https://*.openverse.org https://live.staticflickr.com https://*.staticflickr.com data: https:; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "object-src 'none'; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'; "
+    "base-uri 'self';"
+)
+
+# Built once at import since add_security_headers runs on every response
+SECURITY_HEADERS = {
     # Prevent clickjacking
-    response.headers['X-Frame-Options'] = 'DENY'
+    'X-Frame-Options': 'DENY',
     # Prevent MIME type sniffing
-    response.headers['X-Content-Type-Options'] = 'nosniff'
+    'X-Content-Type-Options': 'nosniff',
     # XSS protection (legacy browsers)
-    response.headers['X-XSS-Protection'] = '1; mode=block'
+    'X-XSS-Protection': '1; mode=block',
     # Referrer policy
-    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
     # HSTS - enforce HTTPS for 1 year (Toolforge always uses HTTPS)
-    response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
-    # Content Security Policy - restrict script sources
-    # Note: 'unsafe-inline' needed for inline scripts; consider moving to external files
-    csp = (
-        "default-src 'self'; "
-        "img-src 'self' https://*.wikimedia.org https://*.wikipedia.org https://api.openverse.org https://*.openverse.org https://live.staticflickr.com https://*.staticflickr.com data: https:; "
-        "script-src 'self' 'unsafe-inline'; "
-        "style-src 'self' 'unsafe-inline'; "
-        "object-src 'none'; "
-        "frame-ancestors 'none'; "
-        "form-action 'self'; "
-        "base-uri 'self';"
-    )
-    response.headers['Content-Security-Policy'] = csp
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+    'Content-Security-Policy': CONTENT_SECURITY_POLICY,
+}
+
+
+@app.after_request
+def add_security_headers(response):
+    """Add security headers to all responses."""
+    response.headers.update(SECURITY_HEADERS)
     return response
 
+
+class HealthCheckMiddleware:
+    """Answer /healthz at the WSGI layer, before Flask dispatch.
+
+    Toolforge polls the health check every few seconds; there is no need to
+    build a request context, run before/after hooks or touch the session for it.
+    """
+
+    BODY = b'OK'
+    HEADERS = [
+        ('Content-Type', 'text/plain; charset=utf-8'),
+        ('Content-Length', str(len(BODY))),
+        *SECURITY_HEADERS.items(),
+    ]
+
+    def __init__(self, wsgi_app, path='/healthz'):
+        self.wsgi_app = wsgi_app
+        self.path = path
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == self.path:
+            start_response('200 OK', list(self.HEADERS))
+            return [self.BODY]
+        return self.wsgi_app(environ, start_response)
+
+
+app.wsgi_app = HealthCheckMiddleware(app.wsgi_app)
+
+# Browsers re-check the service worker at least daily regardless of caching
+SERVICE_WORKER_MAX_AGE = 3600
+
 # Get database instance
 db = get_database()
 db.init_schema()
-
-
-@app.route('/healthz')
-def health_check():
-    """Health check endpoint for Toolforge"""
-    return 'OK', 200
+# gunicorn preloads this module in the master; don't let workers inherit its connection
+db.close()
 
 
 @app.route('/sw.js')
 def service_worker():
     """Serve service worker from root for proper scope"""
-    return send_from_directory('static', 'sw.js', mimetype='application/javascript')
+    response = send_from_directory('static', 'sw.js', mimetype='application/javascript',
+                                   max_age=SERVICE_WORKER_MAX_AGE)
+    response.cache_control.public = True
+    response.headers['Service-Worker-Allowed'] = '/'
+    return response
 
 
 @app.route('/')
 def index():
     """Career list view - ranked by pageviews"""
-    page = request.args.get('page', 1, type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
     per_page = 50
     status_filter = request.args.get('status', '')
     search_query = request.args.get('q', '').strip()
 
-    # Get careers
-    if search_query:
-        careers = db.search_careers(search_query, limit=500)
-    elif status_filter and status_filter in VALID_STATUSES:
-        careers = db.get_careers_by_status(status_filter, limit=1000)
-    else:
-        careers = db.get_all_careers()
+    # Search takes precedence over the status filter
+    search = search_query or None
+    status = status_filter if not search and status_filter in VALID_STATUSES else None
 
-    # Paginate
-    total = len(careers)
+    # Paginate in SQL so only the visible page is materialized
     start = (page - 1) * per_page
-    end = start + per_page
-    careers_page = careers[start:end]
-
-    # Add rank numbers
-    for i, career in enumerate(careers_page):
-        career['rank'] = start + i + 1
-
-    stats = db.get_stats()
+    careers_page = db.get_careers_page(start, per_page, status=status, search=search)
+    stats = db.get_cached_stats()
+    if search:
+        total = db.count_careers(search=search)
+    elif status:
+        # Status and overall totals come from the cached stats, not another count scan
+        total = stats['by_status'].get(status, 0)
+    else:
+        total = stats['total_careers']
 
     return render_template('index.html',
                            careers=careers_page,
@@ -290,15 +385,12 @@ def career_detail(wikidata_id):
     stored_images = db.get_career_images(wikidata_id)
 
     # Get previous/next career for navigation
-    all_careers = db.get_all_careers()
-    current_idx = None
-    for i, c in enumerate(all_careers):
-        if c['wikidata_id'] == wikidata_id:
-            current_idx = i
-            break
+    prev_career = db.get_prev_career(wikidata_id)
+    next_career = db.get_next_career(wikidata_id)
 
-    prev_career = all_careers[current_idx - 1] if current_idx and current_idx > 0 else None
-    next_career = all_careers[current_idx + 1] if current_idx is not None and current_idx < len(all_careers) - 1 else None
+    # "Save and next" is the common path, so have the next article ready
+    if next_career and next_career['wikipedia_url'] and app.config['PREFETCH_NEXT_CAREER']:
+        _prefetch_pool.submit(fetch_career_data, next_career['wikipedia_url'])
 
     return render_template('career_detail.html',
                            career=career,
@@ -306,7 +398,7 @@ def career_detail(wikidata_id):
                            stored_images=stored_images,
                            prev_career=prev_career,
                            next_career=next_career,
-                           valid_statuses=VALID_STATUSES)
+                           valid_statuses=STATUS_CHOICES)
 
 
 @app.route('/career/<wikidata_id>/update', methods=['POST'])
@@ -317,23 +409,19 @@ def update_career(wikidata_id):
     if not is_valid_wikidata_id(wikidata_id):
         abort(400, description="Invalid career ID format")
 
-    status = request.form.get('status')
-    # SECURITY: Limit and sanitize notes field
-    notes = request.form.get('notes', '')[:2000]
-    reviewed_by = request.form.get('reviewed_by', 'anonymous')[:100]
-
-    if status and status in VALID_STATUSES:
-        db.update_career_status(wikidata_id, status, reviewed_by=reviewed_by, notes=notes)
+    update = parse_status_update(request.form)
+    if update:
+        db.update_career_status(wikidata_id, update.status, reviewed_by=update.reviewed_by, notes=update.notes)
+        # Reviewers often save right after editing the article, so refetch it next time
+        career = db.get_career(wikidata_id)
+        if career and career['wikipedia_url']:
+            invalidate_career_data(career['wikipedia_url'])
 
     # Check if "save and next" was clicked
     if 'save_next' in request.form:
-        # Find next career
-        all_careers = db.get_all_careers()
-        for i, c in enumerate(all_careers):
-            if c['wikidata_id'] == wikidata_id:
-                if i + 1 < len(all_careers):
-                    return redirect(url_for('career_detail', wikidata_id=all_careers[i + 1]['wikidata_id']))
-                break
+        next_career = db.get_next_career(wikidata_id)
+        if next_career:
+            return redirect(url_for('career_detail', wikidata_id=next_career['wikidata_id']))
 
     return redirect(url_for('career_detail', wikidata_id=wikidata_id))
 
@@ -342,7 +430,7 @@ def update_career(wikidata_id):
 @rate_limit(api_rate_limiter)
 def api_stats():
     """API endpoint for statistics"""
-    return jsonify(db.get_stats())
+    return jsonify(db.get_cached_stats())
 
 
 @app.route('/api/openverse/search')
@@ -372,7 +460,7 @@ def api_openverse_search():
 def api_openverse_image(image_id):
     """Get details for a specific Openverse image"""
     # SECURITY: Validate image_id is a valid UUID format
-    if not UUID_PATTERN.match(image_id):
+    if not UUID_PATTERN.fullmatch(image_id):
         return jsonify({'error': 'Invalid image ID format'}), 400
 
     image = get_image_detail(image_id)
@@ -426,7 +514,7 @@ def commons_index():
                            total=total,
                            total_pages=(total + per_page - 1) // per_page,
                            status_filter=status_filter,
-                           valid_commons_statuses=VALID_COMMONS_STATUSES)
+                           valid_commons_statuses=COMMONS_STATUS_CHOICES)
 
 
 @app.route('/commons/<wikidata_id>')
@@ -443,20 +531,12 @@ def commons_review(wikidata_id):
 
     category = career['commons_category']
 
-    # Fetch category info and subcategories (these are fast)
-    cat_info = fetch_category_info(category)
-    subcategories = fetch_subcategories(category)
+    # Fetch category info and subcategories in parallel
+    cat_info, subcategories = fetch_category_overview(category)
 
     # Get previous/next career with commons category for navigation
-    all_commons = db.get_careers_with_commons(limit=2000)
-    current_idx = None
-    for i, c in enumerate(all_commons):
-        if c['wikidata_id'] == wikidata_id:
-            current_idx = i
-            break
-
-    prev_career = all_commons[current_idx - 1] if current_idx and current_idx > 0 else None
-    next_career = all_commons[current_idx + 1] if current_idx is not None and current_idx < len(all_commons) - 1 else None
+    prev_career = db.get_prev_career(wikidata_id, commons_only=True)
+    next_career = db.get_next_career(wikidata_id, commons_only=True)
 
     return render_template('commons_review.html',
                            career=career,
@@ -465,7 +545,7 @@ def commons_review(wikidata_id):
                            subcategories=subcategories,
                            prev_career=prev_career,
                            next_career=next_career,
-                           valid_commons_statuses=VALID_COMMONS_STATUSES)
+                           valid_commons_statuses=COMMONS_STATUS_CHOICES)
 
 
 @app.route('/commons/<wikidata_id>/update', methods=['POST'])
@@ -475,20 +555,15 @@ def update_commons_status(wikidata_id):
     if not is_valid_wikidata_id(wikidata_id):
         abort(400, description="Invalid career ID format")
 
-    status = request.form.get('commons_status')
-    notes = request.form.get('notes', '')[:2000]
-
-    if status and status in VALID_COMMONS_STATUSES:
-        db.update_commons_status(wikidata_id, status, notes=notes if notes else None)
+    update = parse_status_update(request.form, field='commons_status', valid=VALID_COMMONS_STATUSES)
+    if update:
+        db.update_commons_status(wikidata_id, update.status, notes=update.notes or None)
 
     # Handle "save and next"
     if 'save_next' in request.form:
-        all_commons = db.get_careers_with_commons(limit=2000)
-        for i, c in enumerate(all_commons):
-            if c['wikidata_id'] == wikidata_id:
-                if i + 1 < len(all_commons):
-                    return redirect(url_for('commons_review', wikidata_id=all_commons[i + 1]['wikidata_id']))
-                break
+        next_career = db.get_next_career(wikidata_id, commons_only=True)
+        if next_career:
+            return redirect(url_for('commons_review', wikidata_id=next_career['wikidata_id']))
 
     return redirect(url_for('commons_review', wikidata_id=wikidata_id))
 
@@ -500,24 +575,15 @@ def quick_review():
 
     if not article:
         # Suggest a random unreviewed career
-        unreviewed = db.get_careers_by_status('unreviewed', limit=100)
-        import random
-        random_career = random.choice(unreviewed)['name'] if unreviewed else None
+        suggestion = db.get_random_career_by_status('unreviewed')
+        random_career = suggestion['name'] if suggestion else None
         return render_template('quick_review.html', article=None, career=None, random_career=random_career)
 
-    # Try to find by name (case-insensitive)
-    careers = db.search_careers(article, limit=10)
-
-    # Look for exact match first
-    career = None
-    for c in careers:
-        if c['name'].lower() == article.lower():
-            career = c
-            break
-
-    # If no exact match, use first result
-    if not career and careers:
-        career = careers[0]
+    # Look for an exact (case-insensitive) name match first, then fall back to search
+    career = db.get_career_by_name(article)
+    if not career:
+        careers = db.search_careers(article, limit=1)
+        career = careers[0] if careers else None
 
     if not career:
         return render_template('quick_review.html', article=article, career=None,
@@ -530,7 +596,7 @@ def quick_review():
                            article=article,
                            career=career,
                            wiki_data=wiki_data,
-                           valid_statuses=VALID_STATUSES)
+                           valid_statuses=STATUS_CHOICES)
 
 
 @app.route('/quick-review/<wikidata_id>/status', methods=['POST'])
@@ -541,16 +607,14 @@ def quick_review_status(wikidata_id):
     if not is_valid_wikidata_id(wikidata_id):
         abort(400, description="Invalid career ID format")
 
-    status = request.form.get('status')
-    # SECURITY: Limit notes field length
-    notes = request.form.get('notes', '')[:2000]
-    if status and status in VALID_STATUSES:
-        db.update_career_status(wikidata_id, status, reviewed_by='quick-review', notes=notes)
+    update = parse_status_update(request.form, reviewed_by='quick-review')
+    if update:
+        db.update_career_status(wikidata_id, update.status, reviewed_by=update.reviewed_by, notes=update.notes)
 
-    # Return to quick review with next unreviewed career
-    careers = db.get_careers_by_status('unreviewed', limit=1)
-    if careers:
-        return redirect(url_for('quick_review', article=careers[0]['name']))
+    # Return to quick review with the next unreviewed career after this one
+    next_career = db.get_next_unreviewed(after_id=wikidata_id)
+    if next_career:
+        return redirect(url_for('quick_review', article=next_career['name']))
     return redirect(url_for('quick_review'))
 
 
@@ -595,7 +659,6 @@ def select_replacement_image(wikidata_id):
 
 
 if __name__ == '__main__':
-    import os
     from db import is_toolforge
 
     # host=0.0.0.0 makes Flask accessible outside the container
@@ -5,16 +5,55 @@ Uses the MediaWiki API to list files in Commons categories and retrieve
 thumbnail URLs and basic metadata.
 """
 
+import json
+import os
 import re
-import requests
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import quote
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import disk_cache
+
+try:
+    # Faster parsing for large file listings when installed
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 HEADERS = {
     'User-Agent': 'WikipediaCareerDiversityTool/1.0 (https://github.com/tieguy/wikipedia-career-images)'
 }
 
 API_URL = "https://commons.wikimedia.org/w/api.php"
 
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# MediaWiki accepts up to 50 titles per query for regular clients
+TITLES_PER_REQUEST = 50
+
+# Keep-alive connection pool for all Commons API calls, retrying transient
+# failures (429s honour Retry-After)
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False),
+))
+
+# On-disk cache for category counts, shared by all worker processes; the
+# counts only feed the overview header so an hour of staleness is fine
+CACHE_DIR = os.environ.get('COMMONS_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'career-images-commons'))
+CATEGORY_INFO_TTL = 60 * 60  # seconds
+
+# Runs independent Commons queries side by side (see fetch_category_overview)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='commons')
+
 
 def fetch_category_members(category: str, limit: int = 50, continue_from: str = None) -> dict:
     """
@@ -52,10 +91,10 @@ def fetch_category_members(category: str, limit: int = 50, continue_from: str =
         file_params['gcmcontinue'] = continue_from
 
     try:
-        response = requests.get(API_URL, params=file_params, headers=HEADERS, timeout=30)
+        response = SESSION.get(API_URL, params=file_params, timeout=30)
         response.raise_for_status()
-        data = response.json()
-    except requests.RequestException as e:
+        data = _json_loads(response.content)
+    except (requests.RequestException, ValueError) as e:
         return {
             'files': [], 'subcategories': [], 'category': category,
             'category_url': _category_url(category), 'error': str(e),
@@ -97,10 +136,10 @@ def fetch_subcategories(category: str) -> list[dict]:
     }
 
     try:
-        response = requests.get(API_URL, params=params, headers=HEADERS, timeout=30)
+        response = SESSION.get(API_URL, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
-    except requests.RequestException:
+        data = _json_loads(response.content)
+    except (requests.RequestException, ValueError):
         return []
 
     subcats = []
@@ -110,7 +149,7 @@ def fetch_subcategories(category: str) -> list[dict]:
         subcats.append({
             'title': title,
             'name': name,
-            'url': f'https://commons.wikimedia.org/wiki/{quote(title.replace(" ", "_"))}',
+            'url': _wikilink(title),
         })
 
     return subcats
@@ -128,33 +167,90 @@ def fetch_category_info(category: str) -> dict:
             'pages': int,
         }
     """
-    params = {
-        'action': 'query',
-        'titles': f'Category:{category}',
-        'prop': 'categoryinfo',
-        'format': 'json',
-    }
+    return fetch_category_info_many([category])[category]
 
-    try:
-        response = requests.get(API_URL, params=params, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-    except requests.RequestException:
-        return {'category': category, 'files': 0, 'subcategories': 0, 'pages': 0}
 
-    pages = data.get('query', {}).get('pages', {})
-    for page in pages.values():
-        info = page.get('categoryinfo', {})
-        return {
-            'category': category,
-            'files': info.get('files', 0),
-            'subcategories': info.get('subcats', 0),
-            'pages': info.get('pages', 0),
+def fetch_category_info_many(categories: list[str]) -> dict[str, dict]:
+    """
+    Fetch info for several Commons categories, TITLES_PER_REQUEST per API call.
+
+    Returns {category: fetch_category_info(category)} for every requested
+    category; cached entries are served without a request.
+    """
+    results = {}
+    misses = []
+    for category in dict.fromkeys(categories):
+        cached = disk_cache.read(CACHE_DIR, category, CATEGORY_INFO_TTL)
+        if cached is not None:
+            results[category] = cached
+        else:
+            misses.append(category)
+
+    for start in range(0, len(misses), TITLES_PER_REQUEST):
+        batch = misses[start:start + TITLES_PER_REQUEST]
+        params = {
+            'action': 'query',
+            'titles': '|'.join(f'Category:{category}' for category in batch),
+            'prop': 'categoryinfo',
+            'format': 'json',
         }
 
+        try:
+            response = SESSION.get(API_URL, params=params, timeout=15)
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            # MediaWiki reports maxlag, ratelimited etc. as HTTP 200 with an error envelope
+            if 'error' in data or 'query' not in data:
+                raise ValueError('MediaWiki API error response')
+        except (requests.RequestException, ValueError):
+            # Not cached, so the next request retries
+            for category in batch:
+                results[category] = _empty_category_info(category)
+            continue
+
+        # Map the API's normalized titles (spaces, capital first letter)
+        # back to the names that were asked for
+        requested = {f'Category:{category}': [category] for category in batch}
+        for item in data.get('query', {}).get('normalized', []):
+            requested.setdefault(item['to'], []).extend(requested.get(item['from'], []))
+
+        for category in batch:
+            results[category] = _empty_category_info(category)
+        for page in data.get('query', {}).get('pages', {}).values():
+            info = page.get('categoryinfo', {})
+            for category in requested.get(page.get('title'), []):
+                results[category] = {
+                    'category': category,
+                    'files': info.get('files', 0),
+                    'subcategories': info.get('subcats', 0),
+                    'pages': info.get('pages', 0),
+                }
+
+        for category in batch:
+            disk_cache.write(CACHE_DIR, category, results[category])
+
+    return results
+
+
+def _empty_category_info(category: str) -> dict:
     return {'category': category, 'files': 0, 'subcategories': 0, 'pages': 0}
 
 
+def fetch_category_overview(category: str) -> tuple[dict, list[dict]]:
+    """
+    Fetch category info and subcategories concurrently.
+
+    File listings can't be fetched this way: each page's gcmcontinue token
+    only comes back with the previous page, so they stay sequential.
+
+    Returns:
+        (fetch_category_info(category), fetch_subcategories(category))
+    """
+    info_future = _executor.submit(fetch_category_info, category)
+    subcategories = fetch_subcategories(category)
+    return info_future.result(), subcategories
+
+
 # Keep the old name working for existing code
 def fetch_category_files(category: str, limit: int = 50) -> dict:
     """Fetch files from a Commons category. Wrapper for backwards compatibility."""
@@ -176,7 +272,9 @@ def _parse_file_pages(pages: dict) -> list[dict]:
         metadata = imageinfo.get('extmetadata', {})
         description = metadata.get('ImageDescription', {}).get('value', '')
         if description:
-            description = re.sub(r'<[^>]+>', '', description)[:500]
+            # Strip a bounded prefix; 4000 raw chars leaves 500 plain ones
+            # even under heavy markup
+            description = _HTML_TAG_RE.sub('', description[:4000])[:500]
 
         files.append({
             'title': page.get('title', ''),
@@ -189,6 +287,14 @@ def _parse_file_pages(pages: dict) -> list[dict]:
     return files
 
 
+# The same category names come up on every page load, so memoize the quoting
+@lru_cache(maxsize=1024)
+def _wikilink(title: str) -> str:
+    """Build a Commons page URL from a full page title."""
+    return f'https://commons.wikimedia.org/wiki/{quote(title.replace(" ", "_"), safe=":/")}'
+
+
+@lru_cache(maxsize=1024)
 def _category_url(category: str) -> str:
     """Build a Commons category URL."""
-    return f'https://commons.wikimedia.org/wiki/Category:{quote(category.replace(" ", "_"))}'
+    return _wikilink(f'Category:{category}')
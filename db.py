@@ -5,10 +5,16 @@ Supports SQLite for local development and MariaDB for Toolforge deployment.
 Auto-detects environment based on presence of ~/replica.my.cnf
 """
 
+import json
 import os
+import re
 import sqlite3
+import threading
+import time
+from bisect import bisect_left
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from contextlib import contextmanager
 
 # Category mapping from Wikidata Q-IDs to readable names
@@ -27,14 +33,25 @@ def get_category(qid: str) -> str:
     return BASE_CATEGORY_MAP.get(qid, 'profession')
 
 
-# For backwards compatibility
-CATEGORY_MAP = type('CategoryMap', (), {'get': lambda self, k, d=None: get_category(k)})()
+class _CategoryMap:
+    """Read-only mapping view over get_category(), kept for backwards compatibility"""
 
-# Valid status values for careers
-VALID_STATUSES = ('unreviewed', 'no_picture', 'needs_diverse_images', 'has_diverse_images', 'not_a_career', 'gender_specific')
+    def __getitem__(self, qid: str) -> str:
+        return get_category(qid)
 
-# Valid status values for Commons category reviews
-VALID_COMMONS_STATUSES = ('unreviewed', 'needs_diversity', 'has_diversity', 'not_applicable')
+    def get(self, qid: str, default: str = None) -> str:
+        return get_category(qid)
+
+
+CATEGORY_MAP = _CategoryMap()
+
+# Status values for careers, in display order
+STATUS_CHOICES = ('unreviewed', 'no_picture', 'needs_diverse_images', 'has_diverse_images', 'not_a_career', 'gender_specific')
+VALID_STATUSES = frozenset(STATUS_CHOICES)
+
+# Status values for Commons category reviews, in display order
+COMMONS_STATUS_CHOICES = ('unreviewed', 'needs_diversity', 'has_diversity', 'not_applicable')
+VALID_COMMONS_STATUSES = frozenset(COMMONS_STATUS_CHOICES)
 
 # Pageview buckets for sorting (lower_bound, label)
 # Sorted descending by traffic - careers sorted alphabetically within each bucket
@@ -49,39 +66,299 @@ PAGEVIEW_BUCKETS = [
 ]
 
 
+# Negated lower bounds ascend, so bisect finds the first bucket a count reaches
+_NEGATED_BUCKET_BOUNDS = [-lower_bound for lower_bound, _ in PAGEVIEW_BUCKETS]
+_BUCKET_LABELS = [label for _, label in PAGEVIEW_BUCKETS]
+
+
 def get_pageview_bucket(avg_daily_views: float) -> tuple[int, str]:
     """
     Get bucket index and label for a pageview count.
     Returns (bucket_index, label) where lower index = higher traffic.
     """
-    views = avg_daily_views or 0
-    for i, (lower_bound, label) in enumerate(PAGEVIEW_BUCKETS):
-        if views >= lower_bound:
-            return (i, label)
-    return (len(PAGEVIEW_BUCKETS) - 1, PAGEVIEW_BUCKETS[-1][1])
+    i = min(bisect_left(_NEGATED_BUCKET_BOUNDS, -(avg_daily_views or 0)), len(_BUCKET_LABELS) - 1)
+    return (i, _BUCKET_LABELS[i])
+
+
+def _with_buckets(careers: list[dict]) -> list[dict]:
+    """
+    Label each career's bucket_index (computed in SQL by CAREER_LIST_COLUMNS)
+    with its bucket_label; returns the same list
+    """
+    for career in careers:
+        career['bucket_label'] = _BUCKET_LABELS[career['bucket_index']]
+    return careers
+
+
+def _bucket_case_sql() -> str:
+    """SQL CASE expression mirroring get_pageview_bucket() on avg_daily_views."""
+    whens = ' '.join(
+        f"WHEN COALESCE(avg_daily_views, 0) >= {lower_bound} THEN {i}"
+        for i, (lower_bound, _) in enumerate(PAGEVIEW_BUCKETS[:-1])
+    )
+    return f"CASE {whens} ELSE {len(PAGEVIEW_BUCKETS) - 1} END"
+
+
+# List order: pageview bucket (busiest first), then name, with a wikidata_id
+# tiebreaker so list ranks are unique and stable. Ranks are precomputed into
+# careers.list_rank whenever careers or pageviews change, so every list query
+# can ORDER BY list_rank off its index instead of sorting in Python.
+BUCKET_SORT_KEYS = (_bucket_case_sql(), 'LOWER(name)', 'wikidata_id')
+BUCKET_ORDER_SQL = ', '.join(BUCKET_SORT_KEYS)
+
+
+# Columns returned by list queries: everything but the long cached lede_text,
+# which only the detail view (get_career) reads, plus the row's pageview
+# bucket so lists need no per-row bucket lookup in Python
+CAREER_LIST_COLUMNS = ', '.join((
+    'wikidata_id', 'name', 'category', 'wikipedia_url',
+    'pageviews_total', 'avg_daily_views', 'last_pageview_update',
+    'status', 'reviewed_by', 'reviewed_at', 'notes',
+    'lede_fetched_at', 'images_fetched_at',
+    'commons_category', 'commons_status', 'list_rank',
+    'created_at', 'updated_at',
+    f'{BUCKET_SORT_KEYS[0]} AS bucket_index',
+))
+
+
+# Every get_stats() count comes from this one scan; the per-category and
+# per-status totals are summed from its (category, status) groups
+STATS_GROUPS_SQL = """
+    SELECT category, status, COUNT(*), COUNT(last_pageview_update), SUM(pageviews_total)
+    FROM careers
+    GROUP BY category, status
+"""
 
 
+def _stats_from_groups(groups, top) -> dict:
+    """Build the get_stats() dict from STATS_GROUPS_SQL rows and the top career row"""
+    stats = {'total_careers': 0, 'with_pageviews': 0, 'total_views': 0,
+             'by_category': {}, 'by_status': {}}
+    for category, status, count, with_pageviews, views in groups:
+        stats['total_careers'] += count
+        stats['with_pageviews'] += with_pageviews
+        stats['total_views'] += int(views or 0)
+        stats['by_category'][category] = stats['by_category'].get(category, 0) + count
+        stats['by_status'][status] = stats['by_status'].get(status, 0) + count
+    if top:
+        stats['top_career'] = {'name': top[0], 'views': top[1]}
+    return stats
+
+
+@lru_cache(maxsize=1)
 def is_toolforge() -> bool:
-    """Check if running on Toolforge"""
+    """Check if running on Toolforge (the home directory is checked once per process)"""
     return os.path.exists(os.path.expanduser("~/replica.my.cnf"))
 
 
+# Word characters minus underscore, matching how FTS5's unicode61 tokenizer splits names
+FTS_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def fts_prefix_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression that prefix-matches every word.
+    Each token is double-quoted so FTS5 operators in user input are inert.
+    Returns None if the text has no searchable tokens.
+    """
+    tokens = FTS_TOKEN_PATTERN.findall(text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+# Backslash-escapes LIKE wildcards (and the escape character) in one pass
+LIKE_ESCAPE = str.maketrans({'\\': '\\\\', '%': '\\%', '_': '\\_'})
+
+
+# Searches for a bare Wikidata ID ("Q123", any case) look the career up by
+# primary key. Use with fullmatch(); re.ASCII keeps \d from matching non-ASCII
+# digits, as in app.py's WIKIDATA_ID_PATTERN
+WIKIDATA_ID_SEARCH_PATTERN = re.compile(r'[Qq]\d+', re.ASCII)
+
+
+# InnoDB's default innodb_ft_min_token_size: shorter words are not indexed
+MARIADB_FULLTEXT_MIN_TOKEN = 3
+
+
+def mariadb_fulltext_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a MariaDB boolean-mode AGAINST expression requiring a
+    prefix match on every word, mirroring fts_prefix_query(). Returns None if
+    any word is too short for the FULLTEXT index (callers fall back to LIKE).
+    """
+    tokens = FTS_TOKEN_PATTERN.findall(text or '')
+    if not tokens or any(len(token) < MARIADB_FULLTEXT_MIN_TOKEN for token in tokens):
+        return None
+    return ' '.join(f'+{token}*' for token in tokens)
+
+
+# How long (seconds) aggregate results such as get_stats() may be served from memory
+STATS_CACHE_TTL = 30
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with a fixed time-to-live per entry"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> lock held while one thread runs its loader
+        self._generation = 0  # bumped by clear(), so loads begun before it aren't stored
+
+    def _fresh(self, key):
+        """The cached entry for key if it has not expired; call with _lock held."""
+        entry = self._entries.get(key)
+        return entry if entry and entry[1] > time.monotonic() else None
+
+    def get(self, key, loader):
+        """
+        Return the cached value for key, calling loader() if missing or expired.
+        Concurrent misses on the same key wait for one loader instead of each
+        running it. A value whose load started before a clear() is returned
+        to its caller but not cached, since it may predate the write.
+        """
+        with self._lock:
+            entry = self._fresh(key)
+            if entry:
+                return entry[0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._fresh(key)
+            if entry:
+                return entry[0]
+            with self._lock:
+                generation = self._generation
+            now = time.monotonic()
+            value = loader()
+            with self._lock:
+                if self._generation == generation:
+                    self._entries[key] = (value, now + self.ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
 class Database:
     """Abstract base for database operations"""
 
+    def __init__(self):
+        self._cache = TTLCache(STATS_CACHE_TTL)
+        self._local = threading.local()
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Yield this thread's database connection, opening it on first use.
+
+        Each thread keeps one connection across calls so pages that run
+        several queries don't pay for a connect and session setup each time.
+        A connection inherited through fork (gunicorn preloads the app) is
+        never reused. Anything left uncommitted when the outermost block
+        exits is rolled back, as closing the connection used to do.
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+            local.depth = 0
+        elif local.depth == 0:
+            self._revive(local.conn)
+
+        local.depth += 1
+        try:
+            yield local.conn
+        finally:
+            local.depth -= 1
+            if local.depth == 0:
+                self._release(local.conn)
+
+    def close(self):
+        """
+        Close this thread's connection, if open; the next call reconnects.
+        Call before forking (app.py does after init_schema) so children never
+        inherit an open connection.
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and getattr(local, 'pid', None) == os.getpid():
+            conn.close()
+        local.conn = None
+        local.pid = None
+
+    def _connect(self):
+        """Open a new connection with session settings applied"""
+        raise NotImplementedError
+
+    def _revive(self, conn):
+        """Make a reused connection usable again (e.g. after a server timeout)"""
+
+    def _release(self, conn):
+        """End any transaction left open so the connection can be reused"""
+        conn.rollback()
+
+    def get_cached_stats(self) -> dict:
+        """get_stats() memoized for STATS_CACHE_TTL seconds; cleared by writes in this process"""
+        return self._cache.get('stats', self.get_stats)
+
+    def invalidate_stats(self):
+        """Drop cached aggregates after a write that changes them"""
+        self._cache.clear()
+
     def init_schema(self):
         raise NotImplementedError
 
+    def maintenance(self):
+        """Refresh planner statistics and reclaim free space (run from cron or the fetcher CLI)"""
+        raise NotImplementedError
+
+    # Single-row writes go through the batch methods, so each backend has one
+    # write path per operation and a caller can switch to batching for free.
+    # The batch writers only re-rank the table when a written row's list
+    # position (bucket or name) changed, so single-row writes stay cheap.
     def upsert_career(self, career: dict):
+        """Insert or update a single career"""
+        self.upsert_careers([career])
+
+    def upsert_careers(self, careers: list[dict], rerank: bool = True):
+        """Batch insert or update careers; rerank=False leaves list_rank to a later refresh_ranks()"""
         raise NotImplementedError
 
-    def upsert_careers(self, careers: list[dict]):
+    def upsert_careers_iter(self, careers, chunk_size: int = 500):
+        """Upsert careers from any iterable, one transaction per chunk_size rows"""
+        chunk = []
+        written = False
+        for career in careers:
+            chunk.append(career)
+            if len(chunk) >= chunk_size:
+                self.upsert_careers(chunk, rerank=False)
+                chunk = []
+                written = True
+        if chunk:
+            self.upsert_careers(chunk, rerank=False)
+            written = True
+        # One re-rank for the whole stream rather than one per chunk
+        if written:
+            self.refresh_ranks()
+
+    def refresh_ranks(self):
+        """Recompute list_rank for every career"""
         raise NotImplementedError
 
     def get_careers_needing_pageviews(self) -> list[dict]:
         raise NotImplementedError
 
     def update_pageviews(self, wikidata_id: str, total_views: int, avg_daily: float):
+        """Update pageview data for a career"""
+        self.update_pageviews_batch([(wikidata_id, total_views, avg_daily)])
+
+    def update_pageviews_batch(self, updates: list[tuple[str, int, float]], rerank: bool = True):
+        """Batch update pageviews; rerank=False leaves list_rank to a later refresh_ranks()"""
         raise NotImplementedError
 
     def get_top_careers(self, limit: int = 20) -> list[dict]:
@@ -93,11 +370,50 @@ class Database:
     def get_stats(self) -> dict:
         raise NotImplementedError
 
+    def iter_all_careers(self, batch: int = 1000) -> Iterator[dict]:
+        """Yield every career in list order, fetching `batch` rows at a time"""
+        raise NotImplementedError
+
     def get_all_careers(self) -> list[dict]:
+        """Get all careers, sorted by pageview bucket then alphabetically within bucket"""
+        return list(self.iter_all_careers())
+
+    def get_careers_page(self, offset: int, limit: int, status: str = None,
+                         search: str = None) -> list[dict]:
+        raise NotImplementedError
+
+    def count_careers(self, status: str = None, search: str = None) -> int:
+        raise NotImplementedError
+
+    def get_prev_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_next_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_random_career_by_status(self, status: str, pool: int = 100) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_next_unreviewed(self, after_id: str = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_career_by_name(self, name: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def search_careers(self, query: str, limit: int = 100) -> list[dict]:
         raise NotImplementedError
 
     # Image methods
     def add_career_image(self, wikidata_id: str, image: dict):
+        """Add an image to a career"""
+        self.add_career_images(wikidata_id, [image])
+
+    def add_career_images(self, wikidata_id: str, images: list[dict]):
+        """Add multiple images to a career"""
+        self.add_career_images_bulk({wikidata_id: images})
+
+    def add_career_images_bulk(self, images_by_career: dict[str, list[dict]]):
+        """Add images for many careers in one transaction: {wikidata_id: [image, ...]}"""
         raise NotImplementedError
 
     def get_career_images(self, wikidata_id: str) -> list[dict]:
@@ -114,20 +430,97 @@ class Database:
         raise NotImplementedError
 
 
+def _image_rows(images_by_career: dict[str, list[dict]]) -> list[tuple]:
+    """career_images insert rows, positioned by list order unless given"""
+    return [
+        (
+            wikidata_id,
+            img['image_url'],
+            img.get('caption'),
+            img.get('position', i),
+            img.get('is_replacement', False),
+            img.get('source', 'wikipedia')
+        )
+        for wikidata_id, images in images_by_career.items()
+        for i, img in enumerate(images)
+    ]
+
+
+# Applied to every SQLite connection. journal_mode=WAL is persistent in the
+# file (re-setting it is a no-op) and lets readers proceed while a review is
+# being saved; synchronous=NORMAL is durable enough under WAL. The cache and
+# mmap sizes are upper bounds - careers.db is only a few MB. foreign_keys is
+# per-connection and off by default; on, it matches MariaDB's InnoDB checks.
+SQLITE_PRAGMAS = (
+    # Must precede the WAL switch, which writes the file header; it only takes
+    # effect on a new database (maintenance() converts older ones)
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _values_batches(conn: sqlite3.Connection, rows: list[tuple], reserved: int = 0):
+    """
+    Split rows into multi-row VALUES lists for one statement each.
+
+    Yields (values_sql, params) pairs such as ('(?, ?), (?, ?)', [a, b, c, d]),
+    each within the connection's bound-parameter limit less `reserved`
+    parameters used elsewhere in the statement.
+    """
+    if not rows:
+        return
+    width = len(rows[0])
+    limit = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) - reserved
+    per_statement = max(1, limit // width)
+    row_sql = f"({', '.join('?' * width)})"
+    for start in range(0, len(rows), per_statement):
+        chunk = rows[start:start + per_statement]
+        yield ', '.join([row_sql] * len(chunk)), [value for row in chunk for value in row]
+
+
+def _dict_rows(cursor: sqlite3.Cursor) -> list[dict]:
+    """Fetch all remaining rows of a tuple cursor as dicts keyed by column name"""
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _dict_row(cursor: sqlite3.Cursor) -> Optional[dict]:
+    """Fetch the next row of a tuple cursor as a dict, or None when exhausted"""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([col[0] for col in cursor.description], row))
+
+
 class SQLiteDatabase(Database):
     """SQLite implementation for local development"""
 
     def __init__(self, db_path: str = "careers.db"):
+        super().__init__()
         self.db_path = db_path
-
-    @contextmanager
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        self._fts_enabled = None
+
+    def _connect(self):
+        # timeout: wait for a concurrent writer (another gunicorn worker or the
+        # fetcher) instead of failing with "database is locked".
+        # cached_statements: sqlite3 keeps prepared statements per connection,
+        # keyed by SQL text; connections are reused, so make room for every
+        # query in this class (the default of 128 is close to that count)
+        # Rows come back as plain tuples: aggregates index them directly and
+        # record queries build dicts through _dict_rows()/_dict_row()
+        conn = sqlite3.connect(self.db_path, timeout=30.0, cached_statements=256)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
 
     def init_schema(self):
         """Create tables if they don't exist"""
@@ -159,6 +552,9 @@ class SQLiteDatabase(Database):
                     commons_category TEXT,
                     commons_status TEXT DEFAULT 'unreviewed',
 
+                    -- Position in the bucket-then-alphabetical list (see _refresh_ranks)
+                    list_rank INTEGER,
+
                     -- Timestamps
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     updated_at TEXT DEFAULT CURRENT_TIMESTAMP
@@ -175,6 +571,7 @@ class SQLiteDatabase(Database):
                     position INTEGER DEFAULT 0,
                     is_replacement INTEGER DEFAULT 0,
                     source TEXT DEFAULT 'wikipedia' CHECK(source IN ('wikipedia', 'openverse')),
+                    metadata TEXT,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (wikidata_id) REFERENCES careers(wikidata_id)
                 )
@@ -182,46 +579,139 @@ class SQLiteDatabase(Database):
 
             # Indexes
             conn.execute("CREATE INDEX IF NOT EXISTS idx_avg_daily_views ON careers(avg_daily_views DESC)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON careers(status)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_career_images_wikidata ON career_images(wikidata_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_careers_name_nocase ON careers(name COLLATE NOCASE)")
+            # Partial index: only the review queue, walked by get_next_unreviewed
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_unreviewed_views
+                ON careers(avg_daily_views DESC, wikidata_id DESC) WHERE status = 'unreviewed'
+            """)
+
+            # Ensure list_rank column exists (for existing DBs)
+            try:
+                conn.execute("ALTER TABLE careers ADD COLUMN list_rank INTEGER")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_careers_list_rank ON careers(list_rank)")
+            # Status-filtered lists read this in list order and stop at LIMIT,
+            # with no sort; it also serves every plain status lookup
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_status_rank ON careers(status, list_rank)")
+            conn.execute("DROP INDEX IF EXISTS idx_status")
+            # Expression index in list order, so _refresh_ranks numbers rows by
+            # walking it instead of sorting the whole table on every write batch
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_careers_list_order ON careers({BUCKET_ORDER_SQL})")
+            # Ensure metadata column exists (for DBs created before it was added)
+            try:
+                conn.execute("ALTER TABLE career_images ADD COLUMN metadata TEXT")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            if conn.execute("SELECT 1 FROM careers WHERE list_rank IS NULL LIMIT 1").fetchone():
+                self._refresh_ranks(conn)
+
+            self._init_fts(conn)
             conn.commit()
 
-    def upsert_career(self, career: dict):
-        """Insert or update a single career"""
+    def maintenance(self):
+        """
+        Hand free pages back to the filesystem and refresh the planner's
+        statistics. The first run on a database created without incremental
+        auto-vacuum does a full VACUUM to switch it over.
+        """
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO careers (wikidata_id, name, category, wikipedia_url, commons_category, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(wikidata_id) DO UPDATE SET
-                    name = excluded.name,
-                    category = excluded.category,
-                    wikipedia_url = excluded.wikipedia_url,
-                    commons_category = COALESCE(excluded.commons_category, careers.commons_category),
-                    updated_at = excluded.updated_at
-            """, (
-                career['wikidata_id'],
-                career['name'],
-                career.get('category'),
-                career.get('wikipedia_url'),
-                career.get('commons_category'),
-                datetime.now().isoformat()
-            ))
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:  # 2 = INCREMENTAL
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
             conn.commit()
 
-    def upsert_careers(self, careers: list[dict]):
-        """Batch insert or update careers"""
+    def refresh_ranks(self):
+        """Recompute list_rank for every career"""
         with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._refresh_ranks(conn)
+            conn.commit()
+
+    def _rank_keys(self, conn, wikidata_ids) -> set[tuple]:
+        """List-order sort keys of the given careers, to tell whether a write moved any"""
+        keys = set()
+        for values, params in _values_batches(conn, [(qid,) for qid in dict.fromkeys(wikidata_ids)]):
+            keys.update(conn.execute(f"""
+                SELECT {BUCKET_ORDER_SQL} FROM careers WHERE wikidata_id IN (VALUES {values})
+            """, params))
+        return keys
+
+    def _refresh_ranks(self, conn):
+        """Recompute list_rank for every career in one statement"""
+        conn.execute(f"""
+            UPDATE careers SET list_rank = ranked.r
+            FROM (
+                SELECT wikidata_id, ROW_NUMBER() OVER (ORDER BY {BUCKET_ORDER_SQL}) AS r
+                FROM careers
+            ) AS ranked
+            WHERE careers.wikidata_id = ranked.wikidata_id
+              AND careers.list_rank IS NOT ranked.r
+        """)
+
+    def _init_fts(self, conn):
+        """
+        Create the careers_fts full-text index over career names, kept in sync
+        by triggers. Falls back to LIKE search if SQLite lacks FTS5.
+        """
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS careers_fts USING fts5(
+                    name,
+                    content='careers',
+                    content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError:
+            self._fts_enabled = False
+            return
+
+        # Triggers are lost if the careers table is rebuilt (see migrations/),
+        # so (re)create them and rebuild the index whenever they are missing
+        has_triggers = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'careers_fts_ai'"
+        ).fetchone()
+        if not has_triggers:
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS careers_fts_ai AFTER INSERT ON careers BEGIN
+                    INSERT INTO careers_fts(rowid, name) VALUES (new.rowid, new.name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS careers_fts_ad AFTER DELETE ON careers BEGIN
+                    INSERT INTO careers_fts(careers_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS careers_fts_au AFTER UPDATE OF name ON careers BEGIN
+                    INSERT INTO careers_fts(careers_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+                    INSERT INTO careers_fts(rowid, name) VALUES (new.rowid, new.name);
+                END;
+            """)
+            conn.execute("INSERT INTO careers_fts(careers_fts) VALUES ('rebuild')")
+        self._fts_enabled = True
+
+    def _has_fts(self, conn) -> bool:
+        """Whether the careers_fts index exists (checked once per instance)"""
+        if self._fts_enabled is None:
+            self._fts_enabled = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'careers_fts'"
+            ).fetchone() is not None
+        return self._fts_enabled
+
+    def upsert_careers(self, careers: list[dict], rerank: bool = True):
+        """Batch insert or update careers; rerank=False leaves list_rank to a later refresh_ranks()"""
+        with self.get_connection() as conn:
+            # Batch writers take the write lock up front (waiting out other
+            # writers) and commit every statement, rank refresh included, at once
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [c['wikidata_id'] for c in careers]
+            before = self._rank_keys(conn, ids) if rerank else None
             now = datetime.now().isoformat()
-            conn.executemany("""
-                INSERT INTO careers (wikidata_id, name, category, wikipedia_url, commons_category, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(wikidata_id) DO UPDATE SET
-                    name = excluded.name,
-                    category = excluded.category,
-                    wikipedia_url = excluded.wikipedia_url,
-                    commons_category = COALESCE(excluded.commons_category, careers.commons_category),
-                    updated_at = excluded.updated_at
-            """, [
+            rows = [
                 (
                     c['wikidata_id'],
                     c['name'],
@@ -231,8 +721,24 @@ class SQLiteDatabase(Database):
                     now
                 )
                 for c in careers
-            ])
+            ]
+            # Multi-row VALUES: one statement execution per few thousand rows
+            # rather than one per career
+            for values, params in _values_batches(conn, rows):
+                conn.execute(f"""
+                    INSERT INTO careers (wikidata_id, name, category, wikipedia_url, commons_category, updated_at)
+                    VALUES {values}
+                    ON CONFLICT(wikidata_id) DO UPDATE SET
+                        name = excluded.name,
+                        category = excluded.category,
+                        wikipedia_url = excluded.wikipedia_url,
+                        commons_category = COALESCE(excluded.commons_category, careers.commons_category),
+                        updated_at = excluded.updated_at
+                """, params)
+            if rerank and self._rank_keys(conn, ids) != before:
+                self._refresh_ranks(conn)
             conn.commit()
+        self.invalidate_stats()
 
     def get_careers_needing_pageviews(self) -> list[dict]:
         """Get careers that don't have pageview data yet"""
@@ -243,46 +749,43 @@ class SQLiteDatabase(Database):
                 WHERE last_pageview_update IS NULL
                 ORDER BY wikidata_id
             """)
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(cursor)
 
-    def update_pageviews(self, wikidata_id: str, total_views: int, avg_daily: float):
-        """Update pageview data for a career"""
+    def update_pageviews_batch(self, updates: list[tuple[str, int, float]], rerank: bool = True):
+        """
+        Batch update pageviews: list of (wikidata_id, total_views, avg_daily).
+        rerank=False leaves list_rank to a later refresh_ranks().
+        """
         with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [update[0] for update in updates]
+            before = self._rank_keys(conn, ids) if rerank else None
             now = datetime.now().isoformat()
-            conn.execute("""
-                UPDATE careers
-                SET pageviews_total = ?,
-                    avg_daily_views = ?,
-                    last_pageview_update = ?,
-                    updated_at = ?
-                WHERE wikidata_id = ?
-            """, (total_views, avg_daily, now, now, wikidata_id))
-            conn.commit()
-
-    def update_pageviews_batch(self, updates: list[tuple[str, int, float]]):
-        """Batch update pageviews: list of (wikidata_id, total_views, avg_daily)"""
-        with self.get_connection() as conn:
-            now = datetime.now().isoformat()
-            conn.executemany("""
-                UPDATE careers
-                SET pageviews_total = ?,
-                    avg_daily_views = ?,
-                    last_pageview_update = ?,
-                    updated_at = ?
-                WHERE wikidata_id = ?
-            """, [(total, avg, now, now, wid) for wid, total, avg in updates])
+            for values, params in _values_batches(conn, updates, reserved=2):
+                conn.execute(f"""
+                    UPDATE careers
+                    SET pageviews_total = v.column2,
+                        avg_daily_views = v.column3,
+                        last_pageview_update = ?,
+                        updated_at = ?
+                    FROM (VALUES {values}) AS v
+                    WHERE careers.wikidata_id = v.column1
+                """, [now, now, *params])
+            if rerank and self._rank_keys(conn, ids) != before:
+                self._refresh_ranks(conn)
             conn.commit()
+        self.invalidate_stats()
 
     def get_top_careers(self, limit: int = 20) -> list[dict]:
         """Get top careers by pageviews"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM careers
+            cursor = conn.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
                 WHERE pageviews_total > 0
                 ORDER BY avg_daily_views DESC
                 LIMIT ?
             """, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _with_buckets(_dict_rows(cursor))
 
     def get_career(self, wikidata_id: str) -> Optional[dict]:
         """Get a single career by Wikidata ID"""
@@ -291,34 +794,35 @@ class SQLiteDatabase(Database):
                 "SELECT * FROM careers WHERE wikidata_id = ?",
                 (wikidata_id,)
             )
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            return _dict_row(cursor)
+
+    def get_career_by_name(self, name: str) -> Optional[dict]:
+        """Get a career by exact name, ignoring case"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM careers WHERE name = ? COLLATE NOCASE ORDER BY avg_daily_views DESC LIMIT 1",
+                (name,)
+            )
+            return _dict_row(cursor)
 
     def get_careers_by_status(self, status: str, limit: int = 100) -> list[dict]:
         """Get careers filtered by review status, sorted by bucket then alphabetically"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM careers
+            cursor = conn.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
                 WHERE status = ?
-                ORDER BY avg_daily_views DESC
+                ORDER BY list_rank
                 LIMIT ?
             """, (status, limit))
-            careers = [dict(row) for row in cursor.fetchall()]
+            careers = _dict_rows(cursor)
 
-        # Add bucket info and re-sort
-        for career in careers:
-            bucket_idx, bucket_label = get_pageview_bucket(career['avg_daily_views'] or 0)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
-
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+        return _with_buckets(careers)
 
     def update_career_status(self, wikidata_id: str, status: str,
                             reviewed_by: str = None, notes: str = None):
         """Update the review status of a career"""
+        now = datetime.now().isoformat()
         with self.get_connection() as conn:
-            now = datetime.now().isoformat()
             conn.execute("""
                 UPDATE careers
                 SET status = ?,
@@ -329,11 +833,12 @@ class SQLiteDatabase(Database):
                 WHERE wikidata_id = ?
             """, (status, reviewed_by, now, notes, now, wikidata_id))
             conn.commit()
+        self.invalidate_stats()
 
     def update_career_lede(self, wikidata_id: str, lede_text: str):
         """Update the cached lede text for a career"""
+        now = datetime.now().isoformat()
         with self.get_connection() as conn:
-            now = datetime.now().isoformat()
             conn.execute("""
                 UPDATE careers
                 SET lede_text = ?,
@@ -346,67 +851,25 @@ class SQLiteDatabase(Database):
     def get_stats(self) -> dict:
         """Get dataset statistics"""
         with self.get_connection() as conn:
-            stats = {}
-
-            # Total count
-            cursor = conn.execute("SELECT COUNT(*) FROM careers")
-            stats['total_careers'] = cursor.fetchone()[0]
-
-            # With pageviews
-            cursor = conn.execute("SELECT COUNT(*) FROM careers WHERE last_pageview_update IS NOT NULL")
-            stats['with_pageviews'] = cursor.fetchone()[0]
-
-            # Total views
-            cursor = conn.execute("SELECT SUM(pageviews_total) FROM careers")
-            stats['total_views'] = cursor.fetchone()[0] or 0
-
-            # By category
-            cursor = conn.execute("""
-                SELECT category, COUNT(*) as count
-                FROM careers
-                GROUP BY category
-            """)
-            stats['by_category'] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # By status
-            cursor = conn.execute("""
-                SELECT status, COUNT(*) as count
-                FROM careers
-                GROUP BY status
-            """)
-            stats['by_status'] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Top career
-            cursor = conn.execute("""
+            groups = conn.execute(STATS_GROUPS_SQL).fetchall()
+            top = conn.execute("""
                 SELECT name, pageviews_total
                 FROM careers
                 ORDER BY avg_daily_views DESC
                 LIMIT 1
-            """)
-            row = cursor.fetchone()
-            if row:
-                stats['top_career'] = {'name': row[0], 'views': row[1]}
+            """).fetchone()
+        return _stats_from_groups(groups, top)
 
-            return stats
-
-    def get_all_careers(self) -> list[dict]:
-        """Get all careers, sorted by pageview bucket then alphabetically within bucket"""
+    def iter_all_careers(self, batch: int = 1000) -> Iterator[dict]:
+        """Yield every career in list order, fetching `batch` rows at a time"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM careers
-                ORDER BY avg_daily_views DESC
+            cursor = conn.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                ORDER BY list_rank
             """)
-            careers = [dict(row) for row in cursor.fetchall()]
-
-        # Add bucket info and re-sort: by bucket index, then alphabetically
-        for career in careers:
-            bucket_idx, bucket_label = get_pageview_bucket(career['avg_daily_views'] or 0)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
-
-        # Sort by bucket (high traffic first), then name alphabetically
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+            columns = [col[0] for col in cursor.description]
+            while rows := cursor.fetchmany(batch):
+                yield from _with_buckets([dict(zip(columns, row)) for row in rows])
 
     def count(self) -> int:
         """Get total number of careers"""
@@ -414,67 +877,160 @@ class SQLiteDatabase(Database):
             cursor = conn.execute("SELECT COUNT(*) FROM careers")
             return cursor.fetchone()[0]
 
-    def search_careers(self, query: str, limit: int = 100) -> list[dict]:
-        """Search careers by name, sorted by bucket then alphabetically"""
+    def _search_clause(self, conn, query: str) -> tuple[str, str]:
+        """
+        WHERE fragment and parameter for a name search: a primary key lookup
+        for a bare Wikidata ID, an FTS5 prefix match when the index exists,
+        otherwise a substring LIKE.
+        """
+        if WIKIDATA_ID_SEARCH_PATTERN.fullmatch(query):
+            return "wikidata_id = ?", query.upper()
+        if self._has_fts(conn):
+            return ("rowid IN (SELECT rowid FROM careers_fts WHERE careers_fts MATCH ?)",
+                    fts_prefix_query(query))
         # SECURITY: Escape SQL LIKE wildcards to prevent wildcard injection
-        escaped_query = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        escaped = query.translate(LIKE_ESCAPE)
+        return "name LIKE ? ESCAPE '\\'", f'%{escaped}%'
+
+    def _careers_filter(self, conn, status: str = None, search: str = None) -> tuple[str, list]:
+        """Build the WHERE clause shared by get_careers_page and count_careers"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if search:
+            clause, param = self._search_clause(conn, search)
+            clauses.append(clause)
+            params.append(param)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def get_careers_page(self, offset: int, limit: int, status: str = None,
+                         search: str = None) -> list[dict]:
+        """Get one page of careers in list_rank (bucket-then-alphabetical) order"""
+        if search and not fts_prefix_query(search):
+            return []
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM careers
-                WHERE name LIKE ? ESCAPE '\\'
-                ORDER BY avg_daily_views DESC
-                LIMIT ?
-            """, (f'%{escaped_query}%', limit))
-            careers = [dict(row) for row in cursor.fetchall()]
+            where, params = self._careers_filter(conn, status, search)
+            cursor = conn.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                {where}
+                ORDER BY list_rank
+                LIMIT ? OFFSET ?
+            """, (*params, limit, offset))
+            careers = _dict_rows(cursor)
+
+        return _with_buckets(careers)
+
+    def count_careers(self, status: str = None, search: str = None) -> int:
+        """Count careers matching the same filters as get_careers_page"""
+        if search and not fts_prefix_query(search):
+            return 0
+        with self.get_connection() as conn:
+            where, params = self._careers_filter(conn, status, search)
+            cursor = conn.execute(f"SELECT COUNT(*) FROM careers {where}", params)
+            return cursor.fetchone()[0]
 
-        # Add bucket info and re-sort
-        for career in careers:
-            bucket_idx, bucket_label = get_pageview_bucket(career['avg_daily_views'] or 0)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
+    def _adjacent_career(self, wikidata_id: str, forward: bool, commons_only: bool) -> Optional[dict]:
+        """Find the neighbouring career by list_rank (wikidata_id, name, wikipedia_url)"""
+        op, order = ('>', 'list_rank') if forward else ('<', 'list_rank DESC')
+        commons_filter = "AND commons_category IS NOT NULL" if commons_only else ""
+        with self.get_connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT wikidata_id, name, wikipedia_url FROM careers
+                WHERE list_rank {op} (
+                    SELECT list_rank FROM careers WHERE wikidata_id = ?
+                ) {commons_filter}
+                ORDER BY {order}
+                LIMIT 1
+            """, (wikidata_id,))
+            return _dict_row(cursor)
 
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+    def get_prev_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        """Get the career listed before this one (wikidata_id, name and wikipedia_url only)"""
+        return self._adjacent_career(wikidata_id, forward=False, commons_only=commons_only)
 
-    # Image methods
+    def get_next_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        """Get the career listed after this one (wikidata_id, name and wikipedia_url only)"""
+        return self._adjacent_career(wikidata_id, forward=True, commons_only=commons_only)
 
-    def add_career_image(self, wikidata_id: str, image: dict):
-        """Add an image to a career"""
+    def get_random_career_by_status(self, status: str, pool: int = 100) -> Optional[dict]:
+        """Pick a random career among the `pool` most-viewed with this status"""
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO career_images (wikidata_id, image_url, caption, position, is_replacement, source)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                wikidata_id,
-                image['image_url'],
-                image.get('caption'),
-                image.get('position', 0),
-                image.get('is_replacement', False),
-                image.get('source', 'wikipedia')
-            ))
-            conn.commit()
+            cursor = conn.execute("""
+                SELECT wikidata_id, name FROM (
+                    SELECT wikidata_id, name FROM careers
+                    WHERE status = ?
+                    ORDER BY avg_daily_views DESC
+                    LIMIT ?
+                )
+                ORDER BY RANDOM()
+                LIMIT 1
+            """, (status, pool))
+            return _dict_row(cursor)
+
+    def get_next_unreviewed(self, after_id: str = None) -> Optional[dict]:
+        """
+        Get the next unreviewed career (wikidata_id and name) by pageviews,
+        continuing after `after_id`; wraps to the top when the queue runs out.
+        """
+        # Without ANALYZE stats the planner prefers idx_status_rank and sorts the
+        # whole queue, so pin the partial index (status must be the literal)
+        with self.get_connection() as conn:
+            row = None
+            if after_id:
+                row = conn.execute("""
+                    SELECT wikidata_id, name FROM careers INDEXED BY idx_unreviewed_views
+                    WHERE status = 'unreviewed'
+                      AND (avg_daily_views, wikidata_id) < (
+                          SELECT avg_daily_views, wikidata_id FROM careers WHERE wikidata_id = ?
+                      )
+                    ORDER BY avg_daily_views DESC, wikidata_id DESC
+                    LIMIT 1
+                """, (after_id,)).fetchone()
+            if row is None:
+                row = conn.execute("""
+                    SELECT wikidata_id, name FROM careers INDEXED BY idx_unreviewed_views
+                    WHERE status = 'unreviewed'
+                    ORDER BY avg_daily_views DESC, wikidata_id DESC
+                    LIMIT 1
+                """).fetchone()
+            return dict(zip(('wikidata_id', 'name'), row)) if row else None
 
-    def add_career_images(self, wikidata_id: str, images: list[dict]):
-        """Add multiple images to a career"""
+    def search_careers(self, query: str, limit: int = 100) -> list[dict]:
+        """Search careers by name (word-prefix match), sorted by bucket then alphabetically"""
+        if not fts_prefix_query(query):
+            return []
         with self.get_connection() as conn:
-            conn.executemany("""
-                INSERT INTO career_images (wikidata_id, image_url, caption, position, is_replacement, source)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, [
-                (
-                    wikidata_id,
-                    img['image_url'],
-                    img.get('caption'),
-                    img.get('position', i),
-                    img.get('is_replacement', False),
-                    img.get('source', 'wikipedia')
-                )
-                for i, img in enumerate(images)
-            ])
-            # Update images_fetched_at timestamp
-            conn.execute("""
-                UPDATE careers SET images_fetched_at = ? WHERE wikidata_id = ?
-            """, (datetime.now().isoformat(), wikidata_id))
+            clause, param = self._search_clause(conn, query)
+            cursor = conn.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                WHERE {clause}
+                ORDER BY list_rank
+                LIMIT ?
+            """, (param, limit))
+            careers = _dict_rows(cursor)
+
+        return _with_buckets(careers)
+
+    # Image methods
+
+    def add_career_images_bulk(self, images_by_career: dict[str, list[dict]]):
+        """Add images for many careers in one transaction: {wikidata_id: [image, ...]}"""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for values, params in _values_batches(conn, _image_rows(images_by_career)):
+                conn.execute(f"""
+                    INSERT INTO career_images (wikidata_id, image_url, caption, position, is_replacement, source)
+                    VALUES {values}
+                """, params)
+            # Update images_fetched_at timestamps
+            now = datetime.now().isoformat()
+            for values, params in _values_batches(conn, [(qid,) for qid in images_by_career], reserved=1):
+                conn.execute(f"""
+                    UPDATE careers SET images_fetched_at = ?
+                    WHERE wikidata_id IN (VALUES {values})
+                """, [now, *params])
             conn.commit()
 
     def get_career_images(self, wikidata_id: str, source: str = None) -> list[dict]:
@@ -492,7 +1048,7 @@ class SQLiteDatabase(Database):
                     WHERE wikidata_id = ?
                     ORDER BY position
                 """, (wikidata_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(cursor)
 
     def clear_career_images(self, wikidata_id: str, source: str = None):
         """Clear images for a career, optionally only from a specific source"""
@@ -514,7 +1070,6 @@ class SQLiteDatabase(Database):
                               source_url: str = None, is_commons: bool = False,
                               commons_filename: str = None):
         """Set an Openverse image as the selected replacement with metadata"""
-        import json
         metadata = json.dumps({
             'creator': creator,
             'license': license,
@@ -525,12 +1080,6 @@ class SQLiteDatabase(Database):
         }) if any([creator, license, license_url, source_url, is_commons, commons_filename]) else None
 
         with self.get_connection() as conn:
-            # Ensure metadata column exists (for existing DBs)
-            try:
-                conn.execute("ALTER TABLE career_images ADD COLUMN metadata TEXT")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-
             # Clear any existing replacement
             conn.execute("""
                 DELETE FROM career_images
@@ -547,8 +1096,8 @@ class SQLiteDatabase(Database):
 
     def update_commons_status(self, wikidata_id: str, status: str, notes: str = None):
         """Update the Commons review status of a career"""
+        now = datetime.now().isoformat()
         with self.get_connection() as conn:
-            now = datetime.now().isoformat()
             if notes is not None:
                 conn.execute("""
                     UPDATE careers
@@ -566,28 +1115,26 @@ class SQLiteDatabase(Database):
         """Get careers that have a Commons category, optionally filtered by commons_status"""
         with self.get_connection() as conn:
             if status:
-                cursor = conn.execute("""
-                    SELECT * FROM careers
+                cursor = conn.execute(f"""
+                    SELECT {CAREER_LIST_COLUMNS} FROM careers
                     WHERE commons_category IS NOT NULL AND commons_status = ?
-                    ORDER BY avg_daily_views DESC
+                    ORDER BY list_rank
                     LIMIT ?
                 """, (status, limit))
             else:
-                cursor = conn.execute("""
-                    SELECT * FROM careers
+                cursor = conn.execute(f"""
+                    SELECT {CAREER_LIST_COLUMNS} FROM careers
                     WHERE commons_category IS NOT NULL
-                    ORDER BY avg_daily_views DESC
+                    ORDER BY list_rank
                     LIMIT ?
                 """, (limit,))
-            careers = [dict(row) for row in cursor.fetchall()]
+            careers = _dict_rows(cursor)
+
+        return _with_buckets(careers)
 
-        for career in careers:
-            bucket_idx, bucket_label = get_pageview_bucket(career['avg_daily_views'] or 0)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
 
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+# Rows per multi-row MariaDB statement, well under max_allowed_packet
+MARIADB_BATCH_ROWS = 500
 
 
 class MariaDBDatabase(Database):
@@ -595,23 +1142,21 @@ class MariaDBDatabase(Database):
 
     def __init__(self):
         """Initialize MariaDB connection using toolforge library or manual config"""
+        super().__init__()
+        self._fulltext_enabled = None
+        # Imported here, like pymysql and toolforge, so SQLite-only runs never load it
+        import configparser
+        config = configparser.ConfigParser()
+        config.read(os.path.expanduser("~/replica.my.cnf"))
         try:
             # Try using toolforge library first (recommended approach)
             import toolforge
             self._use_toolforge_lib = True
-            # Get tool name from environment or replica.my.cnf
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(os.path.expanduser("~/replica.my.cnf"))
             self.tool_user = config['client']['user']
             self.db_name = f"{self.tool_user}__careers"
         except ImportError:
             # Fall back to manual configuration
             self._use_toolforge_lib = False
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(os.path.expanduser("~/replica.my.cnf"))
-
             self.db_config = {
                 'host': 'tools.db.svc.wikimedia.cloud',
                 'user': config['client']['user'],
@@ -619,23 +1164,27 @@ class MariaDBDatabase(Database):
             }
             self.db_name = f"{self.db_config['user']}__careers"
 
-    @contextmanager
-    def get_connection(self):
-        """Get a database connection (context manager for proper cleanup)"""
+    def _connect(self):
         if self._use_toolforge_lib:
             import toolforge
-            conn = toolforge.toolsdb(self.db_name)
-        else:
-            import pymysql
-            conn = pymysql.connect(
-                **self.db_config,
-                database=self.db_name,
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            return toolforge.toolsdb(self.db_name)
+        import pymysql
+        return pymysql.connect(
+            **self.db_config,
+            database=self.db_name,
+            cursorclass=pymysql.cursors.DictCursor
+        )
+
+    def _revive(self, conn):
+        # ToolsDB drops idle connections; reconnect in place if that happened
+        conn.ping(reconnect=True)
+
+    def _release(self, conn):
+        import pymysql
         try:
-            yield conn
-        finally:
-            conn.close()
+            conn.rollback()
+        except pymysql.Error:
+            pass  # Lost connection; _revive() reconnects on next use
 
     def init_schema(self):
         """Create database and tables if they don't exist"""
@@ -674,6 +1223,7 @@ class MariaDBDatabase(Database):
                 images_fetched_at DATETIME,
                 commons_category VARCHAR(255),
                 commons_status VARCHAR(50) DEFAULT 'unreviewed',
+                list_rank INT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                 updated_at DATETIME ON UPDATE CURRENT_TIMESTAMP
             )
@@ -707,11 +1257,80 @@ class MariaDBDatabase(Database):
             cursor.execute("CREATE INDEX idx_career_images_wikidata ON career_images(wikidata_id)")
         except pymysql.err.OperationalError:
             pass
+        try:
+            cursor.execute("CREATE INDEX idx_careers_name ON careers(name)")
+        except pymysql.err.OperationalError:
+            pass
+        try:
+            # MariaDB has no partial indexes; lead with status instead
+            cursor.execute("CREATE INDEX idx_status_views ON careers(status, avg_daily_views, wikidata_id)")
+        except pymysql.err.OperationalError:
+            pass
+
+        cursor.execute("ALTER TABLE careers ADD COLUMN IF NOT EXISTS list_rank INT")
+        try:
+            cursor.execute("CREATE INDEX idx_careers_list_rank ON careers(list_rank)")
+        except pymysql.err.OperationalError:
+            pass
+        try:
+            cursor.execute("CREATE INDEX idx_status_rank ON careers(status, list_rank)")
+        except pymysql.err.OperationalError:
+            pass
+        try:
+            # Word-prefix name search (see mariadb_fulltext_query)
+            cursor.execute("CREATE FULLTEXT INDEX idx_careers_name_ft ON careers(name)")
+        except pymysql.err.OperationalError:
+            pass
+        cursor.execute("SELECT 1 FROM careers WHERE list_rank IS NULL LIMIT 1")
+        if cursor.fetchone():
+            self._refresh_ranks(cursor)
 
         conn.commit()
         cursor.close()
         conn.close()
 
+    def maintenance(self):
+        """Refresh InnoDB index statistics (InnoDB reuses freed pages on its own)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("ANALYZE TABLE careers, career_images")
+            cursor.fetchall()
+            cursor.close()
+
+    def refresh_ranks(self):
+        """Recompute list_rank for every career"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._refresh_ranks(cursor)
+            conn.commit()
+            cursor.close()
+
+    def _rank_keys(self, cursor, wikidata_ids) -> set[tuple]:
+        """List-order sort keys of the given careers, to tell whether a write moved any"""
+        keys = set()
+        ids = list(dict.fromkeys(wikidata_ids))
+        for start in range(0, len(ids), MARIADB_BATCH_ROWS):
+            chunk = ids[start:start + MARIADB_BATCH_ROWS]
+            cursor.execute(f"""
+                SELECT {BUCKET_ORDER_SQL} FROM careers
+                WHERE wikidata_id IN ({', '.join(['%s'] * len(chunk))})
+            """, chunk)
+            keys.update(tuple(row.values()) if isinstance(row, dict) else tuple(row)
+                        for row in cursor.fetchall())
+        return keys
+
+    def _refresh_ranks(self, cursor):
+        """Recompute list_rank for every career in one statement"""
+        cursor.execute(f"""
+            UPDATE careers
+            JOIN (
+                SELECT wikidata_id, ROW_NUMBER() OVER (ORDER BY {BUCKET_ORDER_SQL}) AS r
+                FROM careers
+            ) AS ranked USING (wikidata_id)
+            SET careers.list_rank = ranked.r
+            WHERE NOT (careers.list_rank <=> ranked.r)
+        """)
+
     def _row_to_dict(self, cursor, row) -> dict:
         """Convert a database row to a dictionary"""
         if row is None:
@@ -721,36 +1340,22 @@ class MariaDBDatabase(Database):
         columns = [col[0] for col in cursor.description]
         return dict(zip(columns, row))
 
-    def upsert_career(self, career: dict):
-        """Insert or update a single career"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("""
-                INSERT INTO careers (wikidata_id, name, category, wikipedia_url, commons_category, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    name = VALUES(name),
-                    category = VALUES(category),
-                    wikipedia_url = VALUES(wikipedia_url),
-                    commons_category = COALESCE(VALUES(commons_category), commons_category),
-                    updated_at = VALUES(updated_at)
-            """, (
-                career['wikidata_id'],
-                career['name'],
-                career.get('category'),
-                career.get('wikipedia_url'),
-                career.get('commons_category'),
-                now
-            ))
-            conn.commit()
-            cursor.close()
+    def _rows_to_dicts(self, cursor, rows) -> list[dict]:
+        """Convert database rows to dictionaries, reading the column names once"""
+        if rows and isinstance(rows[0], dict):
+            return list(rows)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
 
-    def upsert_careers(self, careers: list[dict]):
-        """Batch insert or update careers"""
+    def upsert_careers(self, careers: list[dict], rerank: bool = True):
+        """Batch insert or update careers; rerank=False leaves list_rank to a later refresh_ranks()"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            ids = [c['wikidata_id'] for c in careers]
+            before = self._rank_keys(cursor, ids) if rerank else None
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # pymysql's executemany sends this as multi-row INSERT ... VALUES
+            # statements (ON DUPLICATE KEY UPDATE included), not row by row
             cursor.executemany("""
                 INSERT INTO careers (wikidata_id, name, category, wikipedia_url, commons_category, updated_at)
                 VALUES (%s, %s, %s, %s, %s, %s)
@@ -771,8 +1376,11 @@ class MariaDBDatabase(Database):
                 )
                 for c in careers
             ])
+            if rerank and self._rank_keys(cursor, ids) != before:
+                self._refresh_ranks(cursor)
             conn.commit()
             cursor.close()
+        self.invalidate_stats()
 
     def get_careers_needing_pageviews(self) -> list[dict]:
         """Get careers that don't have pageview data yet"""
@@ -785,56 +1393,55 @@ class MariaDBDatabase(Database):
                 ORDER BY wikidata_id
             """)
             rows = cursor.fetchall()
-            result = [self._row_to_dict(cursor, row) for row in rows]
+            result = self._rows_to_dicts(cursor, rows)
             cursor.close()
             return result
 
-    def update_pageviews(self, wikidata_id: str, total_views: int, avg_daily: float):
-        """Update pageview data for a career"""
+    def update_pageviews_batch(self, updates: list[tuple[str, int, float]], rerank: bool = True):
+        """
+        Batch update pageviews: list of (wikidata_id, total_views, avg_daily).
+        rerank=False leaves list_rank to a later refresh_ranks().
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            ids = [update[0] for update in updates]
+            before = self._rank_keys(cursor, ids) if rerank else None
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("""
-                UPDATE careers
-                SET pageviews_total = %s,
-                    avg_daily_views = %s,
-                    last_pageview_update = %s,
-                    updated_at = %s
-                WHERE wikidata_id = %s
-            """, (total_views, avg_daily, now, now, wikidata_id))
-            conn.commit()
-            cursor.close()
-
-    def update_pageviews_batch(self, updates: list[tuple[str, int, float]]):
-        """Batch update pageviews: list of (wikidata_id, total_views, avg_daily)"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.executemany("""
-                UPDATE careers
-                SET pageviews_total = %s,
-                    avg_daily_views = %s,
-                    last_pageview_update = %s,
-                    updated_at = %s
-                WHERE wikidata_id = %s
-            """, [(total, avg, now, now, wid) for wid, total, avg in updates])
+            # One UPDATE ... JOIN per chunk instead of a round trip per row
+            # (executemany only folds INSERTs into multi-row statements)
+            for start in range(0, len(updates), MARIADB_BATCH_ROWS):
+                chunk = updates[start:start + MARIADB_BATCH_ROWS]
+                rows_sql = ' UNION ALL '.join(
+                    ['SELECT %s AS wikidata_id, %s AS total, %s AS avg'] * len(chunk)
+                )
+                cursor.execute(f"""
+                    UPDATE careers
+                    JOIN ({rows_sql}) AS v USING (wikidata_id)
+                    SET careers.pageviews_total = v.total,
+                        careers.avg_daily_views = v.avg,
+                        careers.last_pageview_update = %s,
+                        careers.updated_at = %s
+                """, [value for row in chunk for value in row] + [now, now])
+            if rerank and self._rank_keys(cursor, ids) != before:
+                self._refresh_ranks(cursor)
             conn.commit()
             cursor.close()
+        self.invalidate_stats()
 
     def get_top_careers(self, limit: int = 20) -> list[dict]:
         """Get top careers by pageviews"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM careers
+            cursor.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
                 WHERE pageviews_total > 0
                 ORDER BY avg_daily_views DESC
                 LIMIT %s
             """, (limit,))
             rows = cursor.fetchall()
-            result = [self._row_to_dict(cursor, row) for row in rows]
+            result = self._rows_to_dicts(cursor, rows)
             cursor.close()
-            return result
+            return _with_buckets(result)
 
     def get_career(self, wikidata_id: str) -> Optional[dict]:
         """Get a single career by Wikidata ID"""
@@ -849,75 +1456,62 @@ class MariaDBDatabase(Database):
             cursor.close()
             return result
 
+    def get_career_by_name(self, name: str) -> Optional[dict]:
+        """Get a career by exact name (the default collation is case-insensitive)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM careers WHERE name = %s ORDER BY avg_daily_views DESC LIMIT 1",
+                (name,)
+            )
+            row = cursor.fetchone()
+            result = self._row_to_dict(cursor, row)
+            cursor.close()
+            return result
+
     def get_careers_by_status(self, status: str, limit: int = 100) -> list[dict]:
         """Get careers filtered by review status, sorted by bucket then alphabetically"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM careers
+            cursor.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
                 WHERE status = %s
-                ORDER BY avg_daily_views DESC
+                ORDER BY list_rank
                 LIMIT %s
             """, (status, limit))
             rows = cursor.fetchall()
-            careers = [self._row_to_dict(cursor, row) for row in rows]
+            careers = self._rows_to_dicts(cursor, rows)
             cursor.close()
 
-        # Add bucket info and re-sort
-        for career in careers:
-            avg_views = career.get('avg_daily_views') or 0
-            if hasattr(avg_views, '__float__'):
-                avg_views = float(avg_views)
-            bucket_idx, bucket_label = get_pageview_bucket(avg_views)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
-
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+        return _with_buckets(careers)
 
     def update_career_status(self, wikidata_id: str, status: str,
                             reviewed_by: str = None, notes: str = None):
         """Update the review status of a career"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            if reviewed_by and notes:
-                cursor.execute("""
-                    UPDATE careers
-                    SET status = %s, reviewed_by = %s, reviewed_at = %s, notes = %s, updated_at = %s
-                    WHERE wikidata_id = %s
-                """, (status, reviewed_by, now, notes, now, wikidata_id))
-            elif reviewed_by:
-                cursor.execute("""
-                    UPDATE careers
-                    SET status = %s, reviewed_by = %s, reviewed_at = %s, updated_at = %s
-                    WHERE wikidata_id = %s
-                """, (status, reviewed_by, now, now, wikidata_id))
-            elif notes:
-                cursor.execute("""
-                    UPDATE careers
-                    SET status = %s, reviewed_at = %s, notes = %s, updated_at = %s
-                    WHERE wikidata_id = %s
-                """, (status, now, notes, now, wikidata_id))
-            else:
-                cursor.execute("""
-                    UPDATE careers
-                    SET status = %s, reviewed_at = %s, updated_at = %s
-                    WHERE wikidata_id = %s
-                """, (status, now, now, wikidata_id))
+            cursor.execute("""
+                UPDATE careers
+                SET status = %s,
+                    reviewed_by = COALESCE(%s, reviewed_by),
+                    reviewed_at = NOW(),
+                    notes = COALESCE(%s, notes),
+                    updated_at = NOW()
+                WHERE wikidata_id = %s
+            """, (status, reviewed_by, notes, wikidata_id))
             conn.commit()
             cursor.close()
+        self.invalidate_stats()
 
     def update_career_lede(self, wikidata_id: str, lede_text: str):
         """Update the cached lede text for a career"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             cursor.execute("""
                 UPDATE careers
-                SET lede_text = %s, lede_fetched_at = %s, updated_at = %s
+                SET lede_text = %s, lede_fetched_at = NOW(), updated_at = NOW()
                 WHERE wikidata_id = %s
-            """, (lede_text, now, now, wikidata_id))
+            """, (lede_text, wikidata_id))
             conn.commit()
             cursor.close()
 
@@ -925,75 +1519,36 @@ class MariaDBDatabase(Database):
         """Get dataset statistics"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            stats = {}
-
-            # Total count
-            cursor.execute("SELECT COUNT(*) FROM careers")
-            stats['total_careers'] = cursor.fetchone()[0]
-
-            # With pageviews
-            cursor.execute("SELECT COUNT(*) FROM careers WHERE last_pageview_update IS NOT NULL")
-            stats['with_pageviews'] = cursor.fetchone()[0]
-
-            # Total views
-            cursor.execute("SELECT SUM(pageviews_total) FROM careers")
-            result = cursor.fetchone()[0]
-            stats['total_views'] = int(result) if result else 0
-
-            # By category
-            cursor.execute("""
-                SELECT category, COUNT(*) as count
-                FROM careers
-                GROUP BY category
-            """)
-            stats['by_category'] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # By status
-            cursor.execute("""
-                SELECT status, COUNT(*) as count
-                FROM careers
-                GROUP BY status
-            """)
-            stats['by_status'] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Top career
+            cursor.execute(STATS_GROUPS_SQL)
+            groups = cursor.fetchall()
             cursor.execute("""
                 SELECT name, pageviews_total
                 FROM careers
                 ORDER BY avg_daily_views DESC
                 LIMIT 1
             """)
-            row = cursor.fetchone()
-            if row:
-                stats['top_career'] = {'name': row[0], 'views': row[1]}
-
+            top = cursor.fetchone()
             cursor.close()
-            return stats
+        return _stats_from_groups(groups, top)
 
-    def get_all_careers(self) -> list[dict]:
-        """Get all careers, sorted by pageview bucket then alphabetically within bucket"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM careers
-                ORDER BY avg_daily_views DESC
+    def iter_all_careers(self, batch: int = 1000) -> Iterator[dict]:
+        """Yield every career in list order, fetching `batch` rows at a time"""
+        import pymysql
+        # Rows stream from the server through an unbuffered cursor. That ties up
+        # its connection until the last row is read, so it gets a connection of
+        # its own and the caller can keep querying through get_connection()
+        conn = self._connect()
+        try:
+            cursor = conn.cursor(pymysql.cursors.SSCursor)
+            cursor.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                ORDER BY list_rank
             """)
-            rows = cursor.fetchall()
-            careers = [self._row_to_dict(cursor, row) for row in rows]
+            while rows := cursor.fetchmany(batch):
+                yield from _with_buckets(self._rows_to_dicts(cursor, rows))
             cursor.close()
-
-        # Add bucket info and re-sort
-        for career in careers:
-            avg_views = career.get('avg_daily_views') or 0
-            if hasattr(avg_views, '__float__'):
-                avg_views = float(avg_views)
-            bucket_idx, bucket_label = get_pageview_bucket(avg_views)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
-
-        # Sort by bucket (high traffic first), then name alphabetically
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+        finally:
+            conn.close()
 
     def count(self) -> int:
         """Get total number of careers"""
@@ -1004,77 +1559,187 @@ class MariaDBDatabase(Database):
             cursor.close()
             return result
 
-    def search_careers(self, query: str, limit: int = 100) -> list[dict]:
-        """Search careers by name, sorted by bucket then alphabetically"""
+    def _has_fulltext(self, cursor) -> bool:
+        """Whether the idx_careers_name_ft index exists (checked once per instance)"""
+        if self._fulltext_enabled is None:
+            cursor.execute("""
+                SELECT 1 FROM information_schema.STATISTICS
+                WHERE table_schema = DATABASE() AND table_name = 'careers'
+                  AND index_name = 'idx_careers_name_ft'
+                LIMIT 1
+            """)
+            self._fulltext_enabled = cursor.fetchone() is not None
+        return self._fulltext_enabled
+
+    def _search_clause(self, cursor, query: str) -> tuple[str, str]:
+        """
+        WHERE fragment and parameter for a name search: a primary key lookup
+        for a bare Wikidata ID, a FULLTEXT word-prefix match when the index
+        exists and every word is long enough to be indexed, otherwise a
+        substring LIKE.
+        """
+        if WIKIDATA_ID_SEARCH_PATTERN.fullmatch(query):
+            return "wikidata_id = %s", query.upper()
+        fulltext_query = mariadb_fulltext_query(query)
+        if fulltext_query and self._has_fulltext(cursor):
+            return "MATCH(name) AGAINST(%s IN BOOLEAN MODE)", fulltext_query
         # SECURITY: Escape SQL LIKE wildcards to prevent wildcard injection
-        escaped_query = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        escaped = query.translate(LIKE_ESCAPE)
+        return "name LIKE %s ESCAPE '\\\\'", f'%{escaped}%'
+
+    def _careers_filter(self, cursor, status: str = None, search: str = None) -> tuple[str, list]:
+        """Build the WHERE clause shared by get_careers_page and count_careers"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = %s")
+            params.append(status)
+        if search:
+            clause, param = self._search_clause(cursor, search)
+            clauses.append(clause)
+            params.append(param)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def get_careers_page(self, offset: int, limit: int, status: str = None,
+                         search: str = None) -> list[dict]:
+        """Get one page of careers in list_rank (bucket-then-alphabetical) order"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM careers
-                WHERE name LIKE %s ESCAPE '\\\\'
-                ORDER BY avg_daily_views DESC
-                LIMIT %s
-            """, (f'%{escaped_query}%', limit))
+            where, params = self._careers_filter(cursor, status, search)
+            cursor.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                {where}
+                ORDER BY list_rank
+                LIMIT %s OFFSET %s
+            """, (*params, limit, offset))
             rows = cursor.fetchall()
-            careers = [self._row_to_dict(cursor, row) for row in rows]
+            careers = self._rows_to_dicts(cursor, rows)
             cursor.close()
 
-        # Add bucket info and re-sort
-        for career in careers:
-            avg_views = career.get('avg_daily_views') or 0
-            if hasattr(avg_views, '__float__'):
-                avg_views = float(avg_views)
-            bucket_idx, bucket_label = get_pageview_bucket(avg_views)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
+        return _with_buckets(careers)
 
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+    def count_careers(self, status: str = None, search: str = None) -> int:
+        """Count careers matching the same filters as get_careers_page"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            where, params = self._careers_filter(cursor, status, search)
+            cursor.execute(f"SELECT COUNT(*) FROM careers {where}", params)
+            result = cursor.fetchone()[0]
+            cursor.close()
+            return result
 
-    # Image methods
+    def _adjacent_career(self, wikidata_id: str, forward: bool, commons_only: bool) -> Optional[dict]:
+        """Find the neighbouring career by list_rank (wikidata_id, name, wikipedia_url)"""
+        op, order = ('>', 'list_rank') if forward else ('<', 'list_rank DESC')
+        commons_filter = "AND commons_category IS NOT NULL" if commons_only else ""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT wikidata_id, name, wikipedia_url FROM careers
+                WHERE list_rank {op} (
+                    SELECT list_rank FROM careers WHERE wikidata_id = %s
+                ) {commons_filter}
+                ORDER BY {order}
+                LIMIT 1
+            """, (wikidata_id,))
+            row = cursor.fetchone()
+            result = self._row_to_dict(cursor, row)
+            cursor.close()
+            return result
 
-    def add_career_image(self, wikidata_id: str, image: dict):
-        """Add an image to a career"""
+    def get_prev_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        """Get the career listed before this one (wikidata_id, name and wikipedia_url only)"""
+        return self._adjacent_career(wikidata_id, forward=False, commons_only=commons_only)
+
+    def get_next_career(self, wikidata_id: str, commons_only: bool = False) -> Optional[dict]:
+        """Get the career listed after this one (wikidata_id, name and wikipedia_url only)"""
+        return self._adjacent_career(wikidata_id, forward=True, commons_only=commons_only)
+
+    def get_random_career_by_status(self, status: str, pool: int = 100) -> Optional[dict]:
+        """Pick a random career among the `pool` most-viewed with this status"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO career_images (wikidata_id, image_url, caption, position, is_replacement, source)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                wikidata_id,
-                image['image_url'],
-                image.get('caption'),
-                image.get('position', 0),
-                image.get('is_replacement', False),
-                image.get('source', 'wikipedia')
-            ))
-            conn.commit()
+                SELECT wikidata_id, name FROM (
+                    SELECT wikidata_id, name FROM careers
+                    WHERE status = %s
+                    ORDER BY avg_daily_views DESC
+                    LIMIT %s
+                ) AS top_careers
+                ORDER BY RAND()
+                LIMIT 1
+            """, (status, pool))
+            row = cursor.fetchone()
+            result = self._row_to_dict(cursor, row)
             cursor.close()
+            return result
 
-    def add_career_images(self, wikidata_id: str, images: list[dict]):
-        """Add multiple images to a career"""
+    def get_next_unreviewed(self, after_id: str = None) -> Optional[dict]:
+        """
+        Get the next unreviewed career (wikidata_id and name) by pageviews,
+        continuing after `after_id`; wraps to the top when the queue runs out.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            row = None
+            if after_id:
+                cursor.execute("""
+                    SELECT c.wikidata_id, c.name FROM careers c
+                    JOIN careers cur ON cur.wikidata_id = %s
+                    WHERE c.status = 'unreviewed'
+                      AND (c.avg_daily_views < cur.avg_daily_views
+                           OR (c.avg_daily_views = cur.avg_daily_views AND c.wikidata_id < cur.wikidata_id))
+                    ORDER BY c.avg_daily_views DESC, c.wikidata_id DESC
+                    LIMIT 1
+                """, (after_id,))
+                row = cursor.fetchone()
+            if row is None:
+                cursor.execute("""
+                    SELECT wikidata_id, name FROM careers
+                    WHERE status = 'unreviewed'
+                    ORDER BY avg_daily_views DESC, wikidata_id DESC
+                    LIMIT 1
+                """)
+                row = cursor.fetchone()
+            result = self._row_to_dict(cursor, row)
+            cursor.close()
+            return result
+
+    def search_careers(self, query: str, limit: int = 100) -> list[dict]:
+        """Search careers by name, sorted by bucket then alphabetically"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            clause, param = self._search_clause(cursor, query)
+            cursor.execute(f"""
+                SELECT {CAREER_LIST_COLUMNS} FROM careers
+                WHERE {clause}
+                ORDER BY list_rank
+                LIMIT %s
+            """, (param, limit))
+            rows = cursor.fetchall()
+            careers = self._rows_to_dicts(cursor, rows)
+            cursor.close()
+
+        return _with_buckets(careers)
+
+    # Image methods
+
+    def add_career_images_bulk(self, images_by_career: dict[str, list[dict]]):
+        """Add images for many careers in one transaction: {wikidata_id: [image, ...]}"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.executemany("""
                 INSERT INTO career_images (wikidata_id, image_url, caption, position, is_replacement, source)
                 VALUES (%s, %s, %s, %s, %s, %s)
-            """, [
-                (
-                    wikidata_id,
-                    img['image_url'],
-                    img.get('caption'),
-                    img.get('position', i),
-                    img.get('is_replacement', False),
-                    img.get('source', 'wikipedia')
-                )
-                for i, img in enumerate(images)
-            ])
-            # Update images_fetched_at timestamp
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("""
-                UPDATE careers SET images_fetched_at = %s WHERE wikidata_id = %s
-            """, (now, wikidata_id))
+            """, _image_rows(images_by_career))
+            # Update images_fetched_at timestamps
+            qids = list(images_by_career)
+            for start in range(0, len(qids), MARIADB_BATCH_ROWS):
+                chunk = qids[start:start + MARIADB_BATCH_ROWS]
+                cursor.execute(f"""
+                    UPDATE careers SET images_fetched_at = NOW()
+                    WHERE wikidata_id IN ({', '.join(['%s'] * len(chunk))})
+                """, chunk)
             conn.commit()
             cursor.close()
 
@@ -1095,7 +1760,7 @@ class MariaDBDatabase(Database):
                     ORDER BY position
                 """, (wikidata_id,))
             rows = cursor.fetchall()
-            result = [self._row_to_dict(cursor, row) for row in rows]
+            result = self._rows_to_dicts(cursor, rows)
             cursor.close()
             return result
 
@@ -1121,7 +1786,6 @@ class MariaDBDatabase(Database):
                               source_url: str = None, is_commons: bool = False,
                               commons_filename: str = None):
         """Set an Openverse image as the selected replacement with metadata"""
-        import json
         metadata = json.dumps({
             'creator': creator,
             'license': license,
@@ -1152,18 +1816,17 @@ class MariaDBDatabase(Database):
         """Update the Commons review status of a career"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             if notes is not None:
                 cursor.execute("""
                     UPDATE careers
-                    SET commons_status = %s, notes = COALESCE(%s, notes), updated_at = %s
+                    SET commons_status = %s, notes = COALESCE(%s, notes), updated_at = NOW()
                     WHERE wikidata_id = %s
-                """, (status, notes, now, wikidata_id))
+                """, (status, notes, wikidata_id))
             else:
                 cursor.execute("""
-                    UPDATE careers SET commons_status = %s, updated_at = %s
+                    UPDATE careers SET commons_status = %s, updated_at = NOW()
                     WHERE wikidata_id = %s
-                """, (status, now, wikidata_id))
+                """, (status, wikidata_id))
             conn.commit()
             cursor.close()
 
@@ -1172,33 +1835,24 @@ class MariaDBDatabase(Database):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             if status:
-                cursor.execute("""
-                    SELECT * FROM careers
+                cursor.execute(f"""
+                    SELECT {CAREER_LIST_COLUMNS} FROM careers
                     WHERE commons_category IS NOT NULL AND commons_status = %s
-                    ORDER BY avg_daily_views DESC
+                    ORDER BY list_rank
                     LIMIT %s
                 """, (status, limit))
             else:
-                cursor.execute("""
-                    SELECT * FROM careers
+                cursor.execute(f"""
+                    SELECT {CAREER_LIST_COLUMNS} FROM careers
                     WHERE commons_category IS NOT NULL
-                    ORDER BY avg_daily_views DESC
+                    ORDER BY list_rank
                     LIMIT %s
                 """, (limit,))
             rows = cursor.fetchall()
-            careers = [self._row_to_dict(cursor, row) for row in rows]
+            careers = self._rows_to_dicts(cursor, rows)
             cursor.close()
 
-        for career in careers:
-            avg_views = career.get('avg_daily_views') or 0
-            if hasattr(avg_views, '__float__'):
-                avg_views = float(avg_views)
-            bucket_idx, bucket_label = get_pageview_bucket(avg_views)
-            career['bucket_index'] = bucket_idx
-            career['bucket_label'] = bucket_label
-
-        careers.sort(key=lambda c: (c['bucket_index'], c['name'].lower()))
-        return careers
+        return _with_buckets(careers)
 
 
 def get_database() -> Database:
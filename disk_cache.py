@@ -0,0 +1,54 @@
+"""
+disk_cache.py - Small JSON-file cache shared by all worker processes
+
+Entries live in one file per key under a cache directory and expire by
+file mtime. Caching is best-effort: read errors count as misses and write
+errors are ignored.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def cache_path(directory: str, key: str) -> str:
+    """Cache file for a key"""
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(directory, f'{digest}.json')
+
+
+def read(directory: str, key: str, ttl: float):
+    """Return the cached value if present and younger than ttl seconds, else None"""
+    path = cache_path(directory, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write(directory: str, key: str, value):
+    """Atomically store a JSON-serializable value; never raises"""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, cache_path(directory, key))
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def delete(directory: str, key: str):
+    """Drop a cached value if present"""
+    try:
+        os.unlink(cache_path(directory, key))
+    except OSError:
+        pass
@@ -14,6 +14,7 @@ Commands:
     resume             Continue fetching pageviews for careers that don't have them
     stats              Show dataset statistics
     top N              Show top N careers by pageviews
+    maintain           Reclaim free pages and refresh query planner statistics
 """
 
 import asyncio
@@ -22,14 +23,41 @@ import json
 import os
 import requests
 import sys
+import tempfile
 import time
+from calendar import monthrange
 from datetime import datetime
+from operator import itemgetter
 
+import disk_cache
 from db import get_database
 
+try:
+    # Faster parsing for the large SPARQL result sets when installed
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # Path to cached career classes
 CAREER_CLASSES_FILE = os.path.join(os.path.dirname(__file__), 'career_classes.json')
 
+# Pageview totals are cached on disk so re-running fetch within a week, or
+# resuming after a crash, does not hit the Wikimedia REST API again
+PAGEVIEWS_CACHE_DIR = os.environ.get('PAGEVIEWS_CACHE_DIR',
+                                     os.path.join(tempfile.gettempdir(), 'career-images-pageviews'))
+PAGEVIEWS_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+WDQS_URL = 'https://query.wikidata.org/sparql'
+WDQS_HEADERS = {
+    'User-Agent': 'WikipediaCareerDiversityTool/1.0',
+    'Accept': 'application/sparql-results+json',
+}
+# WDQS allows at most 5 concurrent queries per client IP
+WDQS_CONCURRENCY = 5
+# Throttled or transient responses are retried, honouring Retry-After
+WDQS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+WDQS_RETRIES = 3
+
 
 def log(message: str, level: str = "INFO"):
     """Print timestamped log message"""
@@ -68,6 +96,36 @@ def load_career_classes() -> set[str]:
         }
 
 
+async def run_sparql_batches(queries: list[str], concurrency: int = WDQS_CONCURRENCY) -> list[list[dict] | None]:
+    """
+    Run SPARQL queries against WDQS concurrently.
+    Returns the result bindings for each query, in order; None for failed queries.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async def run_one(query: str, session: aiohttp.ClientSession) -> list[dict] | None:
+        async with semaphore:
+            for attempt in range(WDQS_RETRIES + 1):
+                try:
+                    async with session.post(WDQS_URL, data={'query': query}, headers=WDQS_HEADERS) as response:
+                        if response.status not in WDQS_RETRY_STATUSES or attempt == WDQS_RETRIES:
+                            response.raise_for_status()
+                            return _json_loads(await response.read())['results']['bindings']
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+                        log(f"  WDQS returned {response.status}, retrying in {delay}s", "WARNING")
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    log(f"  SPARQL query failed: {e}", "WARNING")
+                    return None
+                # Back off while still holding the slot, so other queries wait too
+                await asyncio.sleep(delay)
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(*(run_one(q, session) for q in queries))
+
+
 def query_p106_occupations(career_classes: set[str], batch_size: int = 30) -> list[str]:
     """
     Query Wikidata for all P106 occupation values that have P31 to our career classes.
@@ -75,42 +133,26 @@ def query_p106_occupations(career_classes: set[str], batch_size: int = 30) -> li
     """
     log(f"Querying P106 occupations with P31 to {len(career_classes)} career classes...")
 
-    url = 'https://query.wikidata.org/sparql'
-    headers = {
-        'User-Agent': 'WikipediaCareerDiversityTool/1.0',
-        'Accept': 'application/sparql-results+json',
-    }
-
-    all_occupations = set()
     classes_list = list(career_classes)
-
+    queries = []
     for i in range(0, len(classes_list), batch_size):
-        batch = classes_list[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(classes_list) + batch_size - 1) // batch_size
-
-        values = ' '.join(f'wd:{c}' for c in batch)
-        query = f'''SELECT DISTINCT ?occupation WHERE {{
+        values = ' '.join(f'wd:{c}' for c in classes_list[i:i + batch_size])
+        queries.append(f'''SELECT DISTINCT ?occupation WHERE {{
           VALUES ?careerClass {{ {values} }}
           ?person wdt:P106 ?occupation .
           ?occupation wdt:P31 ?careerClass .
-        }}'''
-
-        try:
-            r = requests.post(url, data={'query': query}, headers=headers, timeout=120)
-            r.raise_for_status()
-            bindings = r.json()['results']['bindings']
+        }}''')
 
-            for b in bindings:
-                qid = b['occupation']['value'].split('/')[-1]
-                all_occupations.add(qid)
+    all_occupations = set()
+    results = asyncio.run(run_sparql_batches(queries))
 
-            log(f"  Batch {batch_num}/{total_batches}: {len(bindings)} results, total: {len(all_occupations)}")
+    for batch_num, bindings in enumerate(results, 1):
+        if bindings is None:  # Already logged by run_sparql_batches
+            continue
 
-        except requests.RequestException as e:
-            log(f"  Batch {batch_num} failed: {e}", "WARNING")
+        all_occupations.update(b['occupation']['value'].rsplit('/', 1)[-1] for b in bindings)
 
-        time.sleep(0.5)  # Rate limiting
+        log(f"  Batch {batch_num}/{len(queries)}: {len(bindings)} results, total: {len(all_occupations)}")
 
     log(f"Found {len(all_occupations)} unique P106 occupations")
     return list(all_occupations)
@@ -123,21 +165,10 @@ def fetch_occupation_details(occupation_ids: list[str], batch_size: int = 100) -
     """
     log(f"Fetching details for {len(occupation_ids)} occupations...")
 
-    url = 'https://query.wikidata.org/sparql'
-    headers = {
-        'User-Agent': 'WikipediaCareerDiversityTool/1.0',
-        'Accept': 'application/sparql-results+json',
-    }
-
-    careers = []
-
+    queries = []
     for i in range(0, len(occupation_ids), batch_size):
-        batch = occupation_ids[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(occupation_ids) + batch_size - 1) // batch_size
-
-        values = ' '.join(f'wd:{qid}' for qid in batch)
-        query = f'''
+        values = ' '.join(f'wd:{qid}' for qid in occupation_ids[i:i + batch_size])
+        queries.append(f'''
         SELECT ?occupation ?occupationLabel ?article ?typeId ?commonsCategory WHERE {{
           VALUES ?occupation {{ {values} }}
 
@@ -157,63 +188,63 @@ def fetch_occupation_details(occupation_ids: list[str], batch_size: int = 100) -
           }}
           FILTER(LANG(?occupationLabel) = "en")
         }}
-        '''
-
-        try:
-            r = requests.post(url, data={'query': query}, headers=headers, timeout=120)
-            r.raise_for_status()
-            bindings = r.json()['results']['bindings']
-
-            # Deduplicate (multiple types per item)
-            seen = set()
-            for b in bindings:
-                qid = b['occupation']['value'].split('/')[-1]
-                if qid in seen:
-                    continue
-                seen.add(qid)
-
-                name = b['occupationLabel']['value']
-                if name.startswith('Q'):  # No English label
-                    continue
-
-                wikipedia_url = b['article']['value']
-                type_id = b.get('typeId', {}).get('value', '').split('/')[-1] or None
-                commons_category = b.get('commonsCategory', {}).get('value')
-
-                careers.append({
-                    'wikidata_id': qid,
-                    'name': name,
-                    'category': get_category_from_type(type_id),
-                    'wikipedia_url': wikipedia_url,
-                    'commons_category': commons_category,
-                })
-
-            log(f"  Batch {batch_num}/{total_batches}: {len(seen)} with Wikipedia articles")
-
-        except requests.RequestException as e:
-            log(f"  Batch {batch_num} failed: {e}", "WARNING")
+        ''')
 
-        time.sleep(0.5)
+    careers = []
+    results = asyncio.run(run_sparql_batches(queries))
+
+    for batch_num, bindings in enumerate(results, 1):
+        if bindings is None:  # Already logged by run_sparql_batches
+            continue
+
+        # Deduplicate (multiple types per item)
+        seen = set()
+        for b in bindings:
+            qid = b['occupation']['value'].rsplit('/', 1)[-1]
+            if qid in seen:
+                continue
+            seen.add(qid)
+
+            name = b['occupationLabel']['value']
+            if name.startswith('Q'):  # No English label
+                continue
+
+            type_binding = b.get('typeId')
+            type_id = type_binding['value'].rsplit('/', 1)[-1] if type_binding else None
+            commons_binding = b.get('commonsCategory')
+
+            careers.append({
+                'wikidata_id': qid,
+                'name': name,
+                'category': TYPE_CATEGORIES.get(type_id, 'profession'),
+                'wikipedia_url': b['article']['value'],
+                'commons_category': commons_binding['value'] if commons_binding else None,
+            })
+
+        log(f"  Batch {batch_num}/{len(queries)}: {len(seen)} with Wikipedia articles")
 
     log(f"Found {len(careers)} occupations with English Wikipedia articles")
     return careers
 
 
+# Wikidata type Q-ID → category name (must be in DB allowed values)
+TYPE_CATEGORIES = {
+    'Q28640': 'profession',
+    'Q12737077': 'occupation',
+    'Q192581': 'job',
+    'Q4164871': 'position',
+    'Q136649946': 'position',
+    'Q486983': 'position',   # academic rank → position
+    'Q355567': 'position',   # noble title → position
+    'Q480319': 'position',   # title of authority → position
+    'Q627436': 'occupation', # field of work → occupation
+    'Q5767753': 'position',  # style → position
+}
+
+
 def get_category_from_type(type_id: str) -> str:
     """Map a Wikidata type Q-ID to a category name (must be in DB allowed values)."""
-    base_map = {
-        'Q28640': 'profession',
-        'Q12737077': 'occupation',
-        'Q192581': 'job',
-        'Q4164871': 'position',
-        'Q136649946': 'position',
-        'Q486983': 'position',   # academic rank → position
-        'Q355567': 'position',   # noble title → position
-        'Q480319': 'position',   # title of authority → position
-        'Q627436': 'occupation', # field of work → occupation
-        'Q5767753': 'position',  # style → position
-    }
-    return base_map.get(type_id, 'profession')
+    return TYPE_CATEGORIES.get(type_id, 'profession')
 
 
 def extract_title_from_url(url: str) -> str:
@@ -226,44 +257,53 @@ async def fetch_pageviews(session: aiohttp.ClientSession, title: str) -> tuple[i
     url = f"https://wikimedia.org/api/rest_v1/metrics/pageviews/per-article/en.wikipedia/all-access/user/{title}/monthly/2024010100/2025123100"
     headers = {'User-Agent': 'WikipediaCareerDiversityTool/1.0'}
 
+    cached = disk_cache.read(PAGEVIEWS_CACHE_DIR, url, PAGEVIEWS_CACHE_TTL)
+    if cached is not None:
+        return tuple(cached)
+
     try:
         async with session.get(url, headers=headers) as response:
             if response.status == 200:
-                data = await response.json()
+                data = _json_loads(await response.read())
                 items = data.get('items', [])
-                total_views = sum(item['views'] for item in items)
-                days = len(items) * 30.44
+                total_views = sum(map(itemgetter('views'), items))
+                # Exact length of each month returned; months before the
+                # article existed are absent and don't dilute the average
+                days = sum(monthrange(int(ts[:4]), int(ts[4:6]))[1]
+                           for ts in map(itemgetter('timestamp'), items))
                 avg_daily = total_views / days if days > 0 else 0
-                return (total_views, round(avg_daily, 2))
+                result = (total_views, round(avg_daily, 2))
+                # Only successful responses are cached; failures are retried next run
+                disk_cache.write(PAGEVIEWS_CACHE_DIR, url, result)
+                return result
             return (0, 0.0)
     except Exception:
         return (0, 0.0)
 
 
 async def fetch_pageviews_batch(careers: list[dict], concurrency: int = 50) -> list[tuple[str, int, float]]:
-    """Fetch pageviews for a batch of careers concurrently."""
-    semaphore = asyncio.Semaphore(concurrency)
+    """
+    Fetch pageviews for a batch of careers concurrently.
+    Each worker takes the next career as soon as its previous request finishes,
+    so one slow response never holds up the rest.
+    """
+    pending = iter(careers)  # Shared by the workers; safe within one event loop
+    total = len(careers)
+    results = []
 
-    async def fetch_one(career: dict, session: aiohttp.ClientSession) -> tuple[str, int, float]:
-        async with semaphore:
+    async def worker(session: aiohttp.ClientSession):
+        for career in pending:
             title = extract_title_from_url(career['wikipedia_url'])
-            total, avg = await fetch_pageviews(session, title)
-            return (career['wikidata_id'], total, avg)
+            views, avg = await fetch_pageviews(session, title)
+            results.append((career['wikidata_id'], views, avg))
+
+            progress = len(results)
+            if progress % 500 == 0 or progress == total:
+                log(f"Pageviews: {progress}/{total} ({progress * 100 // total}%)")
 
     connector = aiohttp.TCPConnector(limit=concurrency)
     async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [fetch_one(c, session) for c in careers]
-        total = len(tasks)
-        results = []
-
-        chunk_size = 500
-        for i in range(0, total, chunk_size):
-            chunk = tasks[i:i + chunk_size]
-            chunk_results = await asyncio.gather(*chunk)
-            results.extend(chunk_results)
-
-            progress = min(i + chunk_size, total)
-            log(f"Pageviews: {progress}/{total} ({progress * 100 // total}%)")
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
 
     return results
 
@@ -363,11 +403,12 @@ def cmd_fetch_commons():
         try:
             r = requests.post(url, data={'query': query}, headers=headers, timeout=120)
             r.raise_for_status()
-            for b in r.json()['results']['bindings']:
-                qid = b['occupation']['value'].split('/')[-1]
-                updates[qid] = b['commonsCategory']['value']
+            updates.update(
+                (b['occupation']['value'].rsplit('/', 1)[-1], b['commonsCategory']['value'])
+                for b in _json_loads(r.content)['results']['bindings']
+            )
             log(f"  Batch {batch_num}/{total_batches}: {len(updates)} total with P373")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             log(f"  Batch {batch_num} failed: {e}", "WARNING")
 
         time.sleep(0.5)
@@ -432,6 +473,16 @@ def cmd_top(n: int = 20):
     return 0
 
 
+def cmd_maintain():
+    """Run database maintenance (vacuum and planner statistics)."""
+    db = get_database()
+    start_time = datetime.now()
+    db.maintenance()
+    elapsed = (datetime.now() - start_time).total_seconds()
+    log(f"Maintenance done in {elapsed:.1f} seconds")
+    return 0
+
+
 def main():
     """Main CLI entry point."""
     args = sys.argv[1:]
@@ -463,6 +514,9 @@ def main():
         n = int(args[1]) if len(args) > 1 else 20
         return cmd_top(n)
 
+    elif cmd == 'maintain':
+        return cmd_maintain()
+
     else:
         print(f"Unknown command: {cmd}")
         print(__doc__)
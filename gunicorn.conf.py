@@ -0,0 +1,37 @@
+"""
+gunicorn.conf.py - Production WSGI server settings
+
+Page loads spend most of their time waiting on Wikipedia, Openverse and
+Commons, so each worker runs a thread pool: one slow outbound fetch no
+longer blocks other reviewers. Used by the Procfile (Toolforge) and the
+Dockerfile (Fly.io):
+
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Fixed default (the Procfile's old --workers=4): cpu_count() reports the
+# host's CPUs, not a container's quota. WEB_CONCURRENCY overrides it, e.g. to
+# run fewer workers on 256MB Fly machines
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Import app.py once in the master and fork workers from it: the schema/FTS
+# setup runs once, and compiled templates and bytecode are shared
+# copy-on-write. Safe because app.py holds no open DB connection or running
+# thread at import time (it closes the connection init_schema opened; each
+# worker thread then opens its own on first use, and the prefetch pool starts
+# its threads lazily).
+preload_app = True
+
+# Outbound API calls use 15-30s timeouts; leave headroom for two in one request
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Trust X-Forwarded-* from the platform proxy (Toolforge / Fly terminate TLS)
+forwarded_allow_ips = '*'
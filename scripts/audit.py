@@ -7,31 +7,69 @@ Wikipedia articles are still present in those articles.
 
 Usage:
     uv run python audit.py add <article> <filename> [--notes NOTES]
-    uv run python audit.py check [--all | <article>]
+    uv run python audit.py check [--all | <article>] [--force]
     uv run python audit.py list [--status STATUS]
     uv run python audit.py stats
 """
 
 import argparse
+import asyncio
 import json
 import re
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 DB_PATH = "audit.db"
 
+API_URL = "https://en.wikipedia.org/w/api.php"
+
 HEADERS = {
     'User-Agent': 'WikipediaCareerDiversityTool/1.0 (https://github.com/tieguy/wikipedia-career-images)'
 }
 
+# Reused for every synchronous API call (keep-alive), with retries on
+# rate limiting and transient server errors
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False),
+))
+
+# Parallel Wikipedia requests during check_all
+CHECK_CONCURRENCY = 10
+
+# MediaWiki accepts up to 50 titles per query for regular clients
+TITLES_PER_REQUEST = 50
+
+# check_all skips images found removed more recently than this
+RECHECK_REMOVED_AFTER = timedelta(days=7)
+
+
+# WAL lets `list`/`stats` read while a `check` is writing; NORMAL sync is
+# durable in WAL mode and saves an fsync per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
 
 def get_connection():
     """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=30.0)
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
@@ -53,140 +91,296 @@ def init_db():
         )
     """)
     conn.execute("CREATE INDEX IF NOT EXISTS idx_article ON uploaded_images(article_title)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON uploaded_images(status)")
+    # Covers list_images() by status (no sort, no table lookups) and the
+    # stats GROUP BY; supersedes the old status-only index
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_status_added
+        ON uploaded_images(status, added_at DESC, article_title, filename)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_status")
     conn.commit()
     conn.close()
 
 
+def _strip_file_prefix(filename: str) -> str:
+    """Drop a leading 'File:' (any case) from a filename."""
+    return filename[5:] if filename[:5].lower() == 'file:' else filename
+
+
+def _normalize_filename(filename: str) -> str:
+    """Comparison key for a filename: no 'File:' prefix, lowercase."""
+    return _strip_file_prefix(filename).lower()
+
+
 def add_image(article_title: str, filename: str, notes: str = None):
     """Add an image to the tracking database."""
     conn = get_connection()
 
-    # Normalize filename (remove File: prefix if present)
-    if filename.lower().startswith('file:'):
-        filename = filename[5:]
+    filename = _strip_file_prefix(filename)
 
     try:
-        conn.execute("""
+        # A duplicate returns no row instead of raising IntegrityError
+        added = conn.execute("""
             INSERT INTO uploaded_images (article_title, filename, notes)
             VALUES (?, ?, ?)
-        """, (article_title, filename, notes))
+            ON CONFLICT(article_title, filename) DO NOTHING
+            RETURNING id
+        """, (article_title, filename, notes)).fetchone()
         conn.commit()
-        print(f"Added: {filename} → {article_title}")
-    except sqlite3.IntegrityError:
-        print(f"Already tracking: {filename} in {article_title}")
     finally:
         conn.close()
 
+    if added:
+        print(f"Added: {filename} → {article_title}")
+    else:
+        print(f"Already tracking: {filename} in {article_title}")
 
-def get_article_images(article_title: str) -> set:
-    """Fetch all images currently in a Wikipedia article."""
-    # Use the Wikipedia API to get page content and extract images
-    url = "https://en.wikipedia.org/w/api.php"
-    params = {
+
+def _image_params(article_titles: list[str]) -> dict:
+    """
+    Wikipedia API parameters listing the images in up to 50 articles.
+
+    prop=images reports images from the rendered page, including ones placed
+    by infoboxes and other templates. Scanning the wikitext for [[File:...]]
+    links would miss those and flag them as removed.
+    """
+    return {
         'action': 'query',
-        'titles': article_title,
+        'titles': '|'.join(article_titles),
         'prop': 'images',
-        'imlimit': 500,
+        'imlimit': 'max',
+        'redirects': 1,
         'format': 'json',
+        'formatversion': 2,
     }
 
+
+def _parse_article_images(article_titles: list[str], data: dict) -> dict[str, set]:
+    """
+    Extract normalized image filenames per requested title from one
+    prop=images response page (formatversion=2). Titles the API normalized
+    (e.g. first letter capitalised) or followed as redirects are mapped back
+    to the title that was asked for.
+    """
+    query = data.get('query', {})
+    requested = {title: [title] for title in article_titles}
+    for item in query.get('normalized', []) + query.get('redirects', []):
+        requested.setdefault(item['to'], []).extend(requested.get(item['from'], [item['from']]))
+
+    result = {}
+    for page in query.get('pages', []):
+        titles = requested.get(page.get('title'), [page.get('title')])
+        if 'missing' in page:
+            print(f"Warning: Article '{titles[0]}' not found")
+            continue
+        images = {_normalize_filename(img.get('title', '')) for img in page.get('images', [])}
+        for title in titles:
+            result[title] = images
+    return result
+
+
+def _merge_images(images_by_title: dict[str, set], data: dict, article_titles: list[str]):
+    """Add one response page's images to the running per-title sets."""
+    for title, images in _parse_article_images(article_titles, data).items():
+        if title in images_by_title:
+            images_by_title[title] |= images
+
+
+def get_many_article_images(article_titles: list[str]) -> dict[str, set]:
+    """Fetch the images in up to 50 articles with one (continued) API query."""
+    images_by_title = {title: set() for title in article_titles}
+    params = _image_params(article_titles)
+
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        pages = data.get('query', {}).get('pages', {})
-        images = set()
-
-        for page in pages.values():
-            if page.get('missing'):
-                print(f"Warning: Article '{article_title}' not found")
-                return set()
-            for img in page.get('images', []):
-                # Normalize: remove 'File:' prefix and convert to lowercase for comparison
-                title = img.get('title', '')
-                if title.lower().startswith('file:'):
-                    title = title[5:]
-                images.add(title.lower())
-
-        return images
+        while True:
+            response = SESSION.get(API_URL, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            _merge_images(images_by_title, data, article_titles)
+            # imlimit is shared by all titles; follow continuation for the rest
+            if 'continue' not in data:
+                return images_by_title
+            params = {**_image_params(article_titles), **data['continue']}
 
     except requests.RequestException as e:
-        print(f"Error fetching images for {article_title}: {e}")
-        return set()
+        print(f"Error fetching images for {', '.join(article_titles)}: {e}")
     except Exception as e:
-        print(f"Error parsing response for {article_title}: {e}")
-        return set()
+        print(f"Error parsing response for {', '.join(article_titles)}: {e}")
+    return {title: set() for title in article_titles}
 
 
-def check_image(article_title: str, filename: str) -> str:
-    """Check if an image is still in an article. Returns status."""
-    images = get_article_images(article_title)
+def get_article_images(article_title: str) -> set:
+    """Fetch all images currently in a Wikipedia article."""
+    return get_many_article_images([article_title])[article_title]
 
-    if not images:
-        return 'error'
 
-    # Normalize filename for comparison
-    normalized = filename.lower()
-    if normalized in images:
-        return 'present'
-    else:
-        return 'removed'
+async def get_many_article_images_async(session: aiohttp.ClientSession,
+                                        article_titles: list[str]) -> dict[str, set]:
+    """Async version of get_many_article_images() for concurrent checks."""
+    images_by_title = {title: set() for title in article_titles}
+    params = _image_params(article_titles)
+
+    try:
+        while True:
+            async with session.get(API_URL, params=params) as response:
+                response.raise_for_status()
+                data = await response.json()
+            _merge_images(images_by_title, data, article_titles)
+            if 'continue' not in data:
+                return images_by_title
+            params = {**_image_params(article_titles), **data['continue']}
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching images for {', '.join(article_titles)}: {e}")
+    except Exception as e:
+        print(f"Error parsing response for {', '.join(article_titles)}: {e}")
+    return {title: set() for title in article_titles}
 
 
-def check_all():
-    """Check all tracked images."""
-    conn = get_connection()
-    cursor = conn.execute("SELECT * FROM uploaded_images")
-    rows = cursor.fetchall()
-    conn.close()
+async def fetch_images_for_articles(article_titles: list[str],
+                                    concurrency: int = CHECK_CONCURRENCY) -> dict[str, set]:
+    """
+    Fetch the image sets of many articles: {article_title: images}.
 
-    if not rows:
-        print("No images being tracked. Use 'audit.py add' to add images.")
-        return
+    Titles are sent TITLES_PER_REQUEST at a time, with the batches in flight
+    concurrently.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
 
-    print(f"Checking {len(rows)} tracked images...\n")
+    async def fetch_batch(session: aiohttp.ClientSession, batch: list[str]) -> dict[str, set]:
+        async with semaphore:
+            return await get_many_article_images_async(session, batch)
 
-    results = {'present': 0, 'removed': 0, 'error': 0}
-    removals = []
+    batches = [article_titles[i:i + TITLES_PER_REQUEST]
+               for i in range(0, len(article_titles), TITLES_PER_REQUEST)]
 
-    for row in rows:
-        article = row['article_title']
-        filename = row['filename']
+    # One keep-alive connection per in-flight batch, reused across batches
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    async with aiohttp.ClientSession(headers=HEADERS, timeout=timeout, connector=connector) as session:
+        results = await asyncio.gather(*(fetch_batch(session, batch) for batch in batches))
 
-        status = check_image(article, filename)
-        results[status] += 1
+    article_images = {}
+    for result in results:
+        article_images.update(result)
+    return article_images
 
-        # Update database
-        conn = get_connection()
-        now = datetime.now().isoformat()
 
-        if status == 'removed' and row['status'] != 'removed':
-            conn.execute("""
-                UPDATE uploaded_images
-                SET status = ?, last_checked = ?, removal_detected_at = ?
-                WHERE id = ?
-            """, (status, now, now, row['id']))
-            removals.append((article, filename))
-        else:
-            conn.execute("""
-                UPDATE uploaded_images
-                SET status = ?, last_checked = ?
-                WHERE id = ?
-            """, (status, now, row['id']))
+def check_image(article_title: str, filename: str, images: set = None) -> str:
+    """
+    Check if an image is still in an article. Returns status.
 
-        conn.commit()
-        conn.close()
+    Pass the article's already-fetched image set to skip the API call.
+    """
+    if images is None:
+        images = get_article_images(article_title)
+
+    if not images:
+        return 'error'
+
+    if _normalize_filename(filename) in images:
+        return 'present'
+    else:
+        return 'removed'
 
-        # Print status
-        symbol = {'present': '✓', 'removed': '✗', 'error': '?'}[status]
-        print(f"  {symbol} {filename[:50]} → {article}")
+
+def _save_statuses(conn, updates: list[tuple]):
+    """
+    Write check results in one statement and one transaction.
+
+    Each update is (status, last_checked, removal_detected_at, id); pass
+    None as removal_detected_at to keep the stored value.
+    """
+    with conn:
+        conn.executemany("""
+            UPDATE uploaded_images
+            SET status = ?, last_checked = ?,
+                removal_detected_at = COALESCE(?, removal_detected_at)
+            WHERE id = ?
+        """, updates)
+
+
+def check_all(force: bool = False):
+    """
+    Check all tracked images.
+
+    Images already found removed within RECHECK_REMOVED_AFTER are skipped
+    unless force is set.
+    """
+    started = datetime.now()
+    now = started.isoformat()
+    if force:
+        recent_removal, params = "0", ()
+    else:
+        recent_removal = "status = 'removed' AND IFNULL(removal_detected_at, '') > ?"
+        params = ((started - RECHECK_REMOVED_AFTER).isoformat(),)
+
+    conn = get_connection()
+    try:
+        skipped = conn.execute(
+            f"SELECT COUNT(*) FROM uploaded_images WHERE {recent_removal}", params
+        ).fetchone()[0]
+
+        # Counts come from the article_title index; the rows themselves are
+        # streamed below rather than loaded up front
+        counts = conn.execute(f"""
+            SELECT article_title, COUNT(*) FROM uploaded_images
+            WHERE NOT ({recent_removal})
+            GROUP BY article_title ORDER BY article_title
+        """, params).fetchall()
+
+        if not counts:
+            if skipped:
+                print(f"All {skipped} tracked images were recently found removed. "
+                      f"Use --force to recheck them.")
+            else:
+                print("No images being tracked. Use 'audit.py add' to add images.")
+            return
+
+        print(f"Checking {sum(count for _, count in counts)} tracked images...\n")
+
+        # Fetch each article once, concurrently
+        articles = [article for article, _ in counts]
+        article_images = asyncio.run(fetch_images_for_articles(articles))
+
+        results = {'present': 0, 'removed': 0, 'error': 0}
+        removals = []
+        updates = []
+
+        cursor = conn.execute(f"""
+            SELECT id, article_title, filename, status FROM uploaded_images
+            WHERE NOT ({recent_removal})
+            ORDER BY article_title, filename
+        """, params)
+        for article, group in groupby(cursor, key=itemgetter('article_title')):
+            images = article_images[article]
+
+            for row in group:
+                filename = row['filename']
+
+                status = check_image(article, filename, images)
+                results[status] += 1
+
+                newly_removed = status == 'removed' and row['status'] != 'removed'
+                updates.append((status, now, now if newly_removed else None, row['id']))
+                if newly_removed:
+                    removals.append((article, filename))
+
+                # Print status
+                symbol = {'present': '✓', 'removed': '✗', 'error': '?'}[status]
+                print(f"  {symbol} {filename[:50]} → {article}")
+
+        _save_statuses(conn, updates)
+    finally:
+        conn.close()
 
     print(f"\nSummary:")
     print(f"  Present: {results['present']}")
     print(f"  Removed: {results['removed']}")
     print(f"  Errors:  {results['error']}")
+    if skipped:
+        print(f"  Skipped: {skipped} (removed within the last "
+              f"{RECHECK_REMOVED_AFTER.days} days; use --force to recheck)")
 
     if removals:
         print(f"\nNewly detected removals:")
@@ -197,88 +391,86 @@ def check_all():
 def check_article(article_title: str):
     """Check all tracked images for a specific article."""
     conn = get_connection()
-    cursor = conn.execute(
-        "SELECT * FROM uploaded_images WHERE article_title = ?",
-        (article_title,)
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    try:
+        cursor = conn.execute(
+            "SELECT id, filename, status FROM uploaded_images WHERE article_title = ?",
+            (article_title,)
+        )
+        rows = cursor.fetchall()
 
-    if not rows:
-        print(f"No tracked images for article: {article_title}")
-        return
+        if not rows:
+            print(f"No tracked images for article: {article_title}")
+            return
 
-    print(f"Checking {len(rows)} images for {article_title}...\n")
+        print(f"Checking {len(rows)} images for {article_title}...\n")
 
-    for row in rows:
-        status = check_image(article_title, row['filename'])
-        symbol = {'present': '✓', 'removed': '✗', 'error': '?'}[status]
-        print(f"  {symbol} {row['filename']}")
+        # One API call for the article, not one per tracked image
+        images = get_article_images(article_title)
 
-        # Update database
-        conn = get_connection()
+        updates = []
         now = datetime.now().isoformat()
-        if status == 'removed' and row['status'] != 'removed':
-            conn.execute("""
-                UPDATE uploaded_images
-                SET status = ?, last_checked = ?, removal_detected_at = ?
-                WHERE id = ?
-            """, (status, now, now, row['id']))
-        else:
-            conn.execute("""
-                UPDATE uploaded_images
-                SET status = ?, last_checked = ?
-                WHERE id = ?
-            """, (status, now, row['id']))
-        conn.commit()
+
+        for row in rows:
+            status = check_image(article_title, row['filename'], images)
+            symbol = {'present': '✓', 'removed': '✗', 'error': '?'}[status]
+            print(f"  {symbol} {row['filename']}")
+
+            newly_removed = status == 'removed' and row['status'] != 'removed'
+            updates.append((status, now, now if newly_removed else None, row['id']))
+
+        _save_statuses(conn, updates)
+    finally:
         conn.close()
 
 
 def list_images(status_filter: str = None):
     """List tracked images."""
     conn = get_connection()
+    found = False
+    try:
+        if status_filter:
+            cursor = conn.execute(
+                "SELECT status, article_title, filename, added_at FROM uploaded_images "
+                "WHERE status = ? ORDER BY added_at DESC",
+                (status_filter,)
+            )
+        else:
+            cursor = conn.execute(
+                "SELECT status, article_title, filename, added_at FROM uploaded_images "
+                "ORDER BY added_at DESC"
+            )
+
+        # Print rows as they're read rather than buffering the table
+        for row in cursor:
+            if not found:
+                print(f"{'Status':<10} {'Article':<30} {'Filename':<40} {'Added':<20}")
+                print("-" * 100)
+                found = True
+
+            status = row['status']
+            article = row['article_title'][:28]
+            filename = row['filename'][:38]
+            added = row['added_at'][:10] if row['added_at'] else 'unknown'
+            print(f"{status:<10} {article:<30} {filename:<40} {added:<20}")
+    finally:
+        conn.close()
 
-    if status_filter:
-        cursor = conn.execute(
-            "SELECT * FROM uploaded_images WHERE status = ? ORDER BY added_at DESC",
-            (status_filter,)
-        )
-    else:
-        cursor = conn.execute(
-            "SELECT * FROM uploaded_images ORDER BY added_at DESC"
-        )
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    if not rows:
+    if not found:
         print("No images found.")
-        return
-
-    print(f"{'Status':<10} {'Article':<30} {'Filename':<40} {'Added':<20}")
-    print("-" * 100)
-
-    for row in rows:
-        status = row['status']
-        article = row['article_title'][:28]
-        filename = row['filename'][:38]
-        added = row['added_at'][:10] if row['added_at'] else 'unknown'
-        print(f"{status:<10} {article:<30} {filename:<40} {added:<20}")
 
 
 def show_stats():
     """Show statistics about tracked images."""
     conn = get_connection()
 
-    cursor = conn.execute("SELECT COUNT(*) FROM uploaded_images")
-    total = cursor.fetchone()[0]
-
-    cursor = conn.execute("""
-        SELECT status, COUNT(*) FROM uploaded_images GROUP BY status
-    """)
-    by_status = {row[0]: row[1] for row in cursor.fetchall()}
-
-    conn.close()
+    try:
+        cursor = conn.execute(
+            "SELECT status, COUNT(*) FROM uploaded_images GROUP BY status"
+        )
+        by_status = dict(cursor.fetchall())
+    finally:
+        conn.close()
+    total = sum(by_status.values())
 
     print("Audit Statistics")
     print("=" * 40)
@@ -308,6 +500,8 @@ def main():
     check_group = check_parser.add_mutually_exclusive_group()
     check_group.add_argument('--all', action='store_true', help='Check all tracked images')
     check_group.add_argument('article', nargs='?', help='Check images for specific article')
+    check_parser.add_argument('--force', action='store_true',
+                              help='Also recheck images recently found removed')
 
     # list command
     list_parser = subparsers.add_parser('list', help='List tracked images')
@@ -325,12 +519,10 @@ def main():
     if args.command == 'add':
         add_image(args.article, args.filename, args.notes)
     elif args.command == 'check':
-        if args.all:
-            check_all()
-        elif args.article:
+        if args.article:
             check_article(args.article)
         else:
-            check_all()
+            check_all(force=args.force)
     elif args.command == 'list':
         list_images(args.status)
     elif args.command == 'stats':
@@ -141,11 +141,9 @@ def push_to_sheet():
     worksheet = spreadsheet.worksheet(config['worksheet_name'])
 
     db = get_database()
-    careers = db.get_all_careers()
+    print(f"Pushing {db.count_careers()} careers to Google Sheet...")
 
-    print(f"Pushing {len(careers)} careers to Google Sheet...")
-
-    # Prepare data rows
+    # Prepare data rows, streaming careers rather than holding a second copy
     now = datetime.now().isoformat()
     rows = [[
         c['wikidata_id'],
@@ -159,7 +157,7 @@ def push_to_sheet():
         c.get('reviewed_at', ''),
         c.get('notes', ''),
         now,
-    ] for c in careers]
+    ] for c in db.iter_all_careers()]
 
     # Clear existing data (except headers) and add new
     worksheet.clear()
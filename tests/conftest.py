@@ -15,6 +15,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 ANALYSIS_DIR = Path(__file__).parent.parent / "analysis" / "career-cliff"
 sys.path.insert(0, str(ANALYSIS_DIR))
 
+# Add scripts/ for the audit tool
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
 import pytest
 from db import SQLiteDatabase, VALID_STATUSES
 
@@ -30,8 +34,10 @@ def temp_db():
 
     yield db
 
-    # Cleanup
-    os.unlink(path)
+    # Cleanup (including any WAL sidecar files)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
 
 
 @pytest.fixture
@@ -5,6 +5,7 @@ Tests for app.py - Flask routes and input validation.
 import os
 import sys
 import pytest
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -13,8 +14,10 @@ from app import (
     is_valid_wikidata_id,
     is_valid_url,
     sanitize_search_query,
+    parse_status_update,
     RateLimiter,
 )
+from db import VALID_COMMONS_STATUSES
 
 
 # =============================================================================
@@ -43,6 +46,12 @@ class TestIsValidWikidataId:
         assert is_valid_wikidata_id("Q1'; DROP TABLE careers;--") is False
         assert is_valid_wikidata_id('Q1/../../etc/passwd') is False
 
+    def test_rejects_trailing_newline(self):
+        assert is_valid_wikidata_id('Q42\n') is False
+
+    def test_rejects_non_ascii_digits(self):
+        assert is_valid_wikidata_id('Q\u0664\u0662') is False
+
 
 class TestIsValidUrl:
     """Tests for URL validation."""
@@ -66,6 +75,20 @@ class TestIsValidUrl:
     def test_not_a_url(self):
         assert is_valid_url('not a url') is False
 
+    def test_requires_host(self):
+        assert is_valid_url('https://') is False
+        assert is_valid_url('https:///path') is False
+
+    def test_rejects_trailing_newline_host(self):
+        assert is_valid_url('https://example.com\n') is False
+
+    def test_scheme_case_insensitive(self):
+        assert is_valid_url('HTTPS://example.com/a?b=c') is True
+
+    def test_custom_schemes(self):
+        assert is_valid_url('ftp://example.com', allowed_schemes=('ftp',)) is True
+        assert is_valid_url('https://example.com', allowed_schemes=('ftp',)) is False
+
 
 class TestSanitizeSearchQuery:
     """Tests for search query sanitization."""
@@ -91,6 +114,31 @@ class TestSanitizeSearchQuery:
         assert sanitize_search_query(None) == ''
 
 
+class TestParseStatusUpdate:
+    """Tests for status form validation."""
+
+    def test_valid_status(self):
+        update = parse_status_update({'status': 'no_picture', 'notes': 'x' * 3000})
+        assert update.status == 'no_picture'
+        assert len(update.notes) == 2000
+        assert update.reviewed_by == 'anonymous'
+
+    def test_invalid_or_missing_status(self):
+        assert parse_status_update({'status': 'approved'}) is None
+        assert parse_status_update({}) is None
+
+    def test_fixed_reviewer(self):
+        update = parse_status_update({'status': 'unreviewed', 'reviewed_by': 'someone'},
+                                     reviewed_by='quick-review')
+        assert update.reviewed_by == 'quick-review'
+
+    def test_commons_field(self):
+        form = {'commons_status': 'has_diversity'}
+        assert parse_status_update(form) is None
+        update = parse_status_update(form, field='commons_status', valid=VALID_COMMONS_STATUSES)
+        assert update.status == 'has_diversity'
+
+
 # =============================================================================
 # Rate limiter tests
 # =============================================================================
@@ -124,6 +172,24 @@ class TestRateLimiter:
         limiter.cleanup()
         assert 'old-ip' not in limiter.requests
 
+    def test_allows_again_after_window(self, monkeypatch):
+        limiter = RateLimiter(requests_per_minute=2)
+        monkeypatch.setattr('app.time.time', lambda: 1000.0)
+        assert limiter.is_allowed('test-ip') is True
+        assert limiter.is_allowed('test-ip') is True
+        assert limiter.is_allowed('test-ip') is False
+
+        monkeypatch.setattr('app.time.time', lambda: 1061.0)
+        assert limiter.is_allowed('test-ip') is True
+
+    def test_evicts_least_recent_key_when_full(self):
+        limiter = RateLimiter(requests_per_minute=5, max_keys=2)
+        limiter.is_allowed('ip-1')
+        limiter.is_allowed('ip-2')
+        limiter.is_allowed('ip-1')  # ip-2 is now least recently seen
+        limiter.is_allowed('ip-3')
+        assert set(limiter.requests) == {'ip-1', 'ip-3'}
+
 
 # =============================================================================
 # Route tests
@@ -133,6 +199,7 @@ class TestRateLimiter:
 def client():
     """Flask test client."""
     app.config['TESTING'] = True
+    app.config['PREFETCH_NEXT_CAREER'] = False
     with app.test_client() as client:
         yield client
 
@@ -145,6 +212,24 @@ class TestHealthCheck:
         assert response.status_code == 200
         assert response.data == b'OK'
 
+    def test_health_check_skips_flask_dispatch(self, client):
+        with patch.object(app, 'preprocess_request') as preprocess:
+            response = client.get('/healthz')
+        assert response.status_code == 200
+        preprocess.assert_not_called()
+
+
+class TestServiceWorker:
+    """Tests for the service worker route."""
+
+    def test_served_from_root_with_caching(self, client):
+        response = client.get('/sw.js')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/javascript'
+        assert response.headers['Service-Worker-Allowed'] == '/'
+        assert response.cache_control.public
+        assert response.cache_control.max_age == 3600
+
 
 class TestIndexRoute:
     """Tests for the career list page."""
@@ -166,6 +251,24 @@ class TestIndexRoute:
         response = client.get('/?page=2')
         assert response.status_code == 200
 
+    def test_index_totals_use_cached_stats(self, client, populated_db):
+        populated_db.update_career_status('Q789', 'no_picture')
+        with patch('app.db', populated_db), \
+                patch.object(populated_db, 'count_careers') as count:
+            assert client.get('/').status_code == 200
+            response = client.get('/?status=no_picture')
+        assert response.status_code == 200
+        assert b'Teacher' in response.data
+        count.assert_not_called()
+
+    def test_filtered_rows_numbered_by_position(self, client, populated_db):
+        # Teacher is third overall but the only career with this status
+        populated_db.update_career_status('Q789', 'no_picture')
+        with patch('app.db', populated_db):
+            response = client.get('/?status=no_picture')
+        assert b'<td>1</td>' in response.data
+        assert b'<td>3</td>' not in response.data
+
 
 class TestCareerDetailRoute:
     """Tests for the career detail page."""
@@ -182,6 +285,17 @@ class TestCareerDetailRoute:
         response = client.get('/career/Q999999999')
         assert response.status_code == 404
 
+    def test_prefetches_next_career(self, client, populated_db, monkeypatch):
+        monkeypatch.setitem(app.config, 'PREFETCH_NEXT_CAREER', True)
+        wiki_data = {'title': 'Doctor', 'lede': '', 'thumbnail_url': 'x', 'images': []}
+        with patch('app.db', populated_db), \
+                patch('app.fetch_career_data', return_value=wiki_data) as fetch, \
+                patch('app._prefetch_pool') as pool:
+            response = client.get('/career/Q456')
+        assert response.status_code == 200
+        # Doctor is followed by Software Engineer
+        pool.submit.assert_called_once_with(fetch, 'https://en.wikipedia.org/wiki/Software_engineer')
+
 
 class TestCommonsRoutes:
     """Tests for Commons review routes."""
@@ -244,6 +358,16 @@ class TestCsrfProtection:
         response = client.post('/commons/Q42/update', data={'commons_status': 'unreviewed'})
         assert response.status_code == 403
 
+    def test_non_ascii_token_is_rejected(self, client):
+        with client.session_transaction() as sess:
+            sess['_csrf_token'] = 'a' * 64
+        response = client.post('/career/Q42/update', data={'status': 'unreviewed', '_csrf_token': 'é' * 64})
+        assert response.status_code == 403
+
+    def test_page_view_does_not_set_session_cookie(self, client):
+        response = client.get('/')
+        assert 'Set-Cookie' not in response.headers
+
 
 class TestSecurityHeaders:
     """Tests for security response headers."""
@@ -0,0 +1,349 @@
+"""
+Tests for scripts/audit.py - tracking uploaded images in Wikipedia articles.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+import responses
+import audit
+from audit import (
+    _normalize_filename,
+    _parse_article_images,
+    add_image,
+    check_image,
+    check_all,
+    check_article,
+    get_many_article_images,
+    list_images,
+    show_stats,
+)
+
+
+API_URL = 'https://en.wikipedia.org/w/api.php'
+
+
+@pytest.fixture
+def audit_db(tmp_path, monkeypatch):
+    """Point the audit tool at a fresh per-test database."""
+    path = tmp_path / 'audit.db'
+    monkeypatch.setattr(audit, 'DB_PATH', str(path))
+    audit.init_db()
+    return path
+
+
+@pytest.fixture
+def article_images(monkeypatch):
+    """Serve article image sets from a dict instead of the Wikipedia API."""
+    images = {}
+    calls = []
+
+    async def fake_get_many_article_images_async(session, article_titles):
+        calls.append(list(article_titles))
+        return {title: images.get(title, set()) for title in article_titles}
+
+    monkeypatch.setattr(audit, 'get_many_article_images_async', fake_get_many_article_images_async)
+    return images, calls
+
+
+def fetch_rows(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    rows = {row['filename']: dict(row) for row in conn.execute("SELECT * FROM uploaded_images")}
+    conn.close()
+    return rows
+
+
+class TestConnection:
+    """Tests for audit database connection settings."""
+
+    def test_wal_mode(self, audit_db):
+        conn = audit.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        conn.close()
+
+    def test_status_listing_uses_covering_index(self, audit_db):
+        conn = audit.get_connection()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT status, article_title, filename, added_at "
+            "FROM uploaded_images WHERE status = ? ORDER BY added_at DESC",
+            ('removed',),
+        ).fetchall()
+        conn.close()
+        assert 'COVERING INDEX idx_status_added' in plan[0]['detail']
+
+
+class TestAddImage:
+    """Tests for starting to track an image."""
+
+    def test_adds_once(self, audit_db, capsys):
+        add_image('Nurse', 'a.jpg', notes='first')
+        add_image('Nurse', 'File:a.jpg', notes='second')
+
+        out = capsys.readouterr().out
+        assert 'Added: a.jpg → Nurse' in out
+        assert 'Already tracking: a.jpg in Nurse' in out
+        rows = fetch_rows(audit_db)
+        assert len(rows) == 1
+        assert rows['a.jpg']['notes'] == 'first'
+
+
+class TestNormalizeFilename:
+    """Tests for the filename comparison key."""
+
+    @pytest.mark.parametrize('filename', ['File:Nurse.jpg', 'file:Nurse.jpg', 'FILE:Nurse.jpg', 'Nurse.jpg'])
+    def test_strips_prefix_any_case(self, filename):
+        assert _normalize_filename(filename) == 'nurse.jpg'
+
+    def test_add_image_keeps_case(self, audit_db):
+        add_image('Nurse', 'File:Nurse At Work.jpg')
+        assert 'Nurse At Work.jpg' in fetch_rows(audit_db)
+
+    def test_check_image_ignores_prefix_and_case(self):
+        assert check_image('Nurse', 'File:Nurse.JPG', images={'nurse.jpg'}) == 'present'
+
+
+class TestParseArticleImages:
+    """Tests for normalizing a prop=images response."""
+
+    def test_strips_file_prefix_and_lowercases(self):
+        data = {'query': {'pages': [{'title': 'Nurse', 'images': [
+            {'title': 'File:Nurse At Work.jpg'},
+            {'title': 'File:Icon.svg'},
+        ]}]}}
+        assert _parse_article_images(['Nurse'], data) == {'Nurse': {'nurse at work.jpg', 'icon.svg'}}
+
+    def test_missing_article(self):
+        data = {'query': {'pages': [{'title': 'Nope', 'missing': True}]}}
+        assert _parse_article_images(['Nope'], data) == {}
+
+    def test_maps_normalized_titles_back(self):
+        data = {'query': {
+            'normalized': [{'from': 'nurse', 'to': 'Nurse'}],
+            'pages': [{'title': 'Nurse', 'images': [{'title': 'File:A.jpg'}]}],
+        }}
+        assert _parse_article_images(['nurse'], data) == {'nurse': {'a.jpg'}}
+
+    def test_maps_redirects_back(self):
+        data = {'query': {
+            'normalized': [{'from': 'registered nurse', 'to': 'Registered nurse'}],
+            'redirects': [{'from': 'Registered nurse', 'to': 'Nurse'}],
+            'pages': [{'title': 'Nurse', 'images': [{'title': 'File:A.jpg'}]}],
+        }}
+        assert _parse_article_images(['registered nurse'], data) == {'registered nurse': {'a.jpg'}}
+
+
+class TestGetManyArticleImages:
+    """Tests for the batched multi-title image query."""
+
+    @responses.activate
+    def test_one_request_for_several_titles(self):
+        responses.add(responses.GET, API_URL, json={'query': {'pages': [
+            {'title': 'Nurse', 'images': [{'title': 'File:A.jpg'}]},
+            {'title': 'Welder', 'images': [{'title': 'File:B.jpg'}]},
+        ]}})
+
+        result = get_many_article_images(['Nurse', 'Welder'])
+
+        assert result == {'Nurse': {'a.jpg'}, 'Welder': {'b.jpg'}}
+        assert len(responses.calls) == 1
+        assert responses.calls[0].request.params['titles'] == 'Nurse|Welder'
+        assert responses.calls[0].request.params['imlimit'] == 'max'
+        assert responses.calls[0].request.params['formatversion'] == '2'
+        assert responses.calls[0].request.params['redirects'] == '1'
+
+    @responses.activate
+    def test_follows_continuation(self):
+        responses.add(responses.GET, API_URL, json={
+            'continue': {'imcontinue': '1|B.jpg', 'continue': '||'},
+            'query': {'pages': [{'title': 'Nurse', 'images': [{'title': 'File:A.jpg'}]}]},
+        })
+        responses.add(responses.GET, API_URL, json={
+            'query': {'pages': [{'title': 'Nurse', 'images': [{'title': 'File:B.jpg'}]}]},
+        })
+
+        assert get_many_article_images(['Nurse']) == {'Nurse': {'a.jpg', 'b.jpg'}}
+        assert responses.calls[1].request.params['imcontinue'] == '1|B.jpg'
+
+    @responses.activate
+    def test_error_returns_empty_sets(self):
+        responses.add(responses.GET, API_URL, status=500)
+        assert get_many_article_images(['Nurse', 'Welder']) == {'Nurse': set(), 'Welder': set()}
+
+
+class TestCheckAll:
+    """Tests for checking every tracked image."""
+
+    def test_updates_statuses(self, audit_db, article_images):
+        images, _ = article_images
+        images['Nurse'] = {'nurse at work.jpg'}
+        add_image('Nurse', 'File:Nurse at work.jpg')
+        add_image('Nurse', 'Old nurse photo.jpg')
+        add_image('Welder', 'Welder.jpg')
+
+        check_all()
+
+        rows = fetch_rows(audit_db)
+        assert rows['Nurse at work.jpg']['status'] == 'present'
+        assert rows['Old nurse photo.jpg']['status'] == 'removed'
+        assert rows['Old nurse photo.jpg']['removal_detected_at'] is not None
+        assert rows['Welder.jpg']['status'] == 'error'
+
+    def test_keeps_first_removal_time(self, audit_db, article_images):
+        images, _ = article_images
+        images['Nurse'] = {'other.jpg'}
+        add_image('Nurse', 'a.jpg')
+
+        check_all()
+        first = fetch_rows(audit_db)['a.jpg']
+        check_all()
+        second = fetch_rows(audit_db)['a.jpg']
+
+        assert second['removal_detected_at'] == first['removal_detected_at']
+        assert second['last_checked'] >= first['last_checked']
+
+    def test_skips_recent_removals(self, audit_db, article_images, capsys):
+        images, calls = article_images
+        images['Nurse'] = {'a.jpg'}
+        add_image('Nurse', 'a.jpg')
+        add_image('Welder', 'gone.jpg')
+        conn = sqlite3.connect(audit_db)
+        conn.execute("""UPDATE uploaded_images SET status = 'removed',
+                        removal_detected_at = ? WHERE filename = 'gone.jpg'""",
+                     (datetime.now().isoformat(),))
+        conn.commit()
+        conn.close()
+
+        check_all()
+
+        assert calls == [['Nurse']]
+        assert 'Skipped: 1' in capsys.readouterr().out
+
+        check_all(force=True)
+
+        assert calls[-1] == ['Nurse', 'Welder']
+
+    def test_rechecks_old_removals(self, audit_db, article_images):
+        _, calls = article_images
+        add_image('Welder', 'gone.jpg')
+        conn = sqlite3.connect(audit_db)
+        conn.execute("""UPDATE uploaded_images SET status = 'removed',
+                        removal_detected_at = ? WHERE filename = 'gone.jpg'""",
+                     ((datetime.now() - timedelta(days=8)).isoformat(),))
+        conn.commit()
+        conn.close()
+
+        check_all()
+
+        assert calls == [['Welder']]
+
+    def test_fetches_each_article_once(self, audit_db, article_images):
+        images, calls = article_images
+        images['Nurse'] = {'a.jpg'}
+        for filename in ('a.jpg', 'b.jpg', 'c.jpg'):
+            add_image('Nurse', filename)
+
+        check_all()
+
+        assert calls == [['Nurse']]
+
+    def test_uses_one_connection(self, audit_db, article_images, monkeypatch):
+        for filename in ('a.jpg', 'b.jpg'):
+            add_image('Nurse', filename)
+        opened = []
+        real_get_connection = audit.get_connection
+        monkeypatch.setattr(audit, 'get_connection',
+                            lambda: opened.append(1) or real_get_connection())
+
+        check_all()
+
+        assert len(opened) == 1
+
+    def test_batches_titles(self, audit_db, article_images, monkeypatch):
+        _, calls = article_images
+        monkeypatch.setattr(audit, 'TITLES_PER_REQUEST', 2)
+        for article in ('A', 'B', 'C'):
+            add_image(article, 'x.jpg')
+
+        check_all()
+
+        assert sorted(calls) == [['A', 'B'], ['C']]
+
+    def test_nothing_tracked(self, audit_db, article_images, capsys):
+        check_all()
+        assert 'No images being tracked' in capsys.readouterr().out
+
+
+class TestCheckArticle:
+    """Tests for checking one article's tracked images."""
+
+    def test_fetches_article_once(self, audit_db, monkeypatch):
+        calls = []
+
+        def fake_get_many_article_images(article_titles):
+            calls.append(article_titles[0])
+            return {article_titles[0]: {'a.jpg'}}
+
+        monkeypatch.setattr(audit, 'get_many_article_images', fake_get_many_article_images)
+        add_image('Nurse', 'a.jpg')
+        add_image('Nurse', 'b.jpg')
+
+        check_article('Nurse')
+
+        assert calls == ['Nurse']
+        rows = fetch_rows(audit_db)
+        assert rows['a.jpg']['status'] == 'present'
+        assert rows['b.jpg']['status'] == 'removed'
+
+
+class TestListImages:
+    """Tests for listing tracked images."""
+
+    def test_lists_matching_rows(self, audit_db, article_images, capsys):
+        images, _ = article_images
+        images['Nurse'] = {'a.jpg'}
+        add_image('Nurse', 'a.jpg')
+        add_image('Nurse', 'b.jpg')
+        check_all()
+        capsys.readouterr()
+
+        list_images('removed')
+
+        out = capsys.readouterr().out
+        assert out.startswith('Status')
+        assert 'b.jpg' in out
+        assert 'a.jpg' not in out
+
+    def test_no_rows(self, audit_db, capsys):
+        list_images()
+        assert capsys.readouterr().out == 'No images found.\n'
+
+
+class TestShowStats:
+    """Tests for the stats summary."""
+
+    def test_counts_by_status(self, audit_db, article_images, capsys):
+        images, _ = article_images
+        images['Nurse'] = {'a.jpg'}
+        images['Welder'] = {'other.jpg'}
+        add_image('Nurse', 'a.jpg')
+        add_image('Nurse', 'b.jpg')
+        add_image('Welder', 'c.jpg')
+        check_all()
+        capsys.readouterr()
+
+        show_stats()
+
+        out = capsys.readouterr().out
+        assert 'Total tracked images: 3' in out
+        assert 'present: 1 (33.3%)' in out
+        assert 'removed: 2 (66.7%)' in out
+
+    def test_empty(self, audit_db, capsys):
+        show_stats()
+
+        out = capsys.readouterr().out
+        assert 'Total tracked images: 0' in out
+        assert 'present: 0 (0.0%)' in out
@@ -2,13 +2,17 @@
 Tests for commons.py - Wikimedia Commons API integration.
 """
 
+import os
 import pytest
 import responses
+import commons
 from commons import (
     fetch_category_members,
     fetch_subcategories,
     fetch_category_info,
+    fetch_category_info_many,
     fetch_category_files,
+    fetch_category_overview,
     _parse_file_pages,
     _category_url,
 )
@@ -17,6 +21,13 @@ from commons import (
 API_URL = 'https://commons.wikimedia.org/w/api.php'
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the category info cache at a per-test directory."""
+    monkeypatch.setattr(commons, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
 class TestFetchCategoryMembers:
     """Tests for fetching files from a Commons category."""
 
@@ -129,6 +140,14 @@ class TestFetchCategoryMembers:
         assert result['files'] == []
         assert 'error' in result
 
+    @responses.activate
+    def test_handles_invalid_json(self):
+        responses.add(responses.GET, API_URL, body='<html>Service unavailable</html>', status=200)
+
+        result = fetch_category_members('Broken category')
+        assert result['files'] == []
+        assert 'error' in result
+
     @responses.activate
     def test_strips_html_from_descriptions(self):
         responses.add(
@@ -180,6 +199,7 @@ class TestFetchSubcategories:
         assert subcats[0]['name'] == 'DJs by nationality'
         assert subcats[0]['title'] == 'Category:DJs by nationality'
         assert 'commons.wikimedia.org' in subcats[0]['url']
+        assert subcats[1]['url'] == 'https://commons.wikimedia.org/wiki/Category:Female_DJs'
 
     @responses.activate
     def test_empty_subcategories(self):
@@ -215,6 +235,7 @@ class TestFetchCategoryInfo:
                 'query': {
                     'pages': {
                         '123': {
+                            'title': 'Category:Test',
                             'categoryinfo': {
                                 'files': 42,
                                 'subcats': 5,
@@ -236,7 +257,7 @@ class TestFetchCategoryInfo:
     def test_handles_missing_categoryinfo(self):
         responses.add(
             responses.GET, API_URL,
-            json={'query': {'pages': {'123': {}}}},
+            json={'query': {'pages': {'123': {'title': 'Category:No info'}}}},
             status=200,
         )
 
@@ -255,6 +276,121 @@ class TestFetchCategoryInfo:
         info = fetch_category_info('Error')
         assert info['files'] == 0
 
+    @responses.activate
+    def test_second_call_served_from_cache(self):
+        responses.add(
+            responses.GET, API_URL,
+            json={'query': {'pages': {'123': {'title': 'Category:Test', 'categoryinfo': {'files': 42}}}}},
+        )
+
+        first = fetch_category_info('Test')
+        second = fetch_category_info('Test')
+
+        assert first == second
+        assert second['files'] == 42
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_expired_entry_refetched(self, monkeypatch):
+        responses.add(
+            responses.GET, API_URL,
+            json={'query': {'pages': {'123': {'title': 'Category:Test', 'categoryinfo': {'files': 42}}}}},
+        )
+        monkeypatch.setattr(commons, 'CATEGORY_INFO_TTL', -1)
+
+        fetch_category_info('Test')
+        fetch_category_info('Test')
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_errors_not_cached(self, cache_dir, monkeypatch):
+        monkeypatch.setattr(commons.SESSION.get_adapter(API_URL).max_retries, 'backoff_factor', 0)
+        responses.add(responses.GET, API_URL, status=500)
+
+        fetch_category_info('Error')
+
+        assert os.listdir(cache_dir) == []
+
+
+class TestFetchCategoryInfoMany:
+    """Tests for fetching several categories' info per request."""
+
+    @responses.activate
+    def test_one_request_for_several_categories(self):
+        responses.add(responses.GET, API_URL, json={'query': {
+            'normalized': [{'from': 'Category:nurses', 'to': 'Category:Nurses'}],
+            'pages': {
+                '1': {'title': 'Category:Nurses', 'categoryinfo': {'files': 7}},
+                '2': {'title': 'Category:Welders', 'categoryinfo': {'files': 3}},
+                '-1': {'title': 'Category:Nope', 'missing': ''},
+            },
+        }})
+
+        info = fetch_category_info_many(['nurses', 'Welders', 'Nope'])
+
+        assert len(responses.calls) == 1
+        assert responses.calls[0].request.params['titles'] == 'Category:nurses|Category:Welders|Category:Nope'
+        assert info['nurses']['files'] == 7
+        assert info['Welders']['files'] == 3
+        assert info['Nope']['files'] == 0
+
+    @responses.activate
+    def test_batches_titles(self, monkeypatch):
+        monkeypatch.setattr(commons, 'TITLES_PER_REQUEST', 2)
+        responses.add(responses.GET, API_URL, json={'query': {'pages': {}}})
+
+        fetch_category_info_many(['A', 'B', 'C'])
+
+        assert [call.request.params['titles'] for call in responses.calls] == [
+            'Category:A|Category:B', 'Category:C',
+        ]
+
+    @responses.activate
+    def test_only_fetches_uncached(self):
+        responses.add(responses.GET, API_URL, json={'query': {'pages': {
+            '1': {'title': 'Category:A', 'categoryinfo': {'files': 1}},
+        }}})
+        fetch_category_info('A')
+
+        fetch_category_info_many(['A', 'B'])
+
+        assert responses.calls[1].request.params['titles'] == 'Category:B'
+
+    @responses.activate
+    def test_api_error_envelope_not_cached(self, cache_dir):
+        responses.add(responses.GET, API_URL, status=200, json={
+            'error': {'code': 'maxlag', 'info': 'Waiting for a database server: 6 seconds lagged.'},
+        })
+
+        info = fetch_category_info_many(['A', 'B'])
+
+        assert info['A']['files'] == 0 and info['B']['files'] == 0
+        assert os.listdir(cache_dir) == []
+
+
+class TestFetchCategoryOverview:
+    """Tests for fetching category info and subcategories together."""
+
+    @responses.activate
+    def test_returns_info_and_subcategories(self):
+        responses.add(
+            responses.GET, API_URL,
+            match=[responses.matchers.query_param_matcher({'prop': 'categoryinfo'}, strict_match=False)],
+            json={'query': {'pages': {'123': {'title': 'Category:Nurses',
+                                              'categoryinfo': {'files': 7, 'subcats': 1}}}}},
+        )
+        responses.add(
+            responses.GET, API_URL,
+            match=[responses.matchers.query_param_matcher({'list': 'categorymembers'}, strict_match=False)],
+            json={'query': {'categorymembers': [{'title': 'Category:Female nurses'}]}},
+        )
+
+        info, subcategories = fetch_category_overview('Nurses')
+
+        assert info['files'] == 7
+        assert [s['name'] for s in subcategories] == ['Female nurses']
+
 
 class TestParseFilePages:
     """Tests for the internal _parse_file_pages helper."""
@@ -294,6 +430,21 @@ class TestParseFilePages:
     def test_empty_pages(self):
         assert _parse_file_pages({}) == []
 
+    def test_long_marked_up_description_truncated(self):
+        pages = {
+            '100': {
+                'pageid': 100,
+                'title': 'File:Long.jpg',
+                'imageinfo': [{
+                    'url': 'https://example.com/long.jpg',
+                    'extmetadata': {'ImageDescription': {'value': '<i>word</i> ' * 5000}},
+                }],
+            }
+        }
+        description = _parse_file_pages(pages)[0]['description']
+        assert len(description) == 500
+        assert '<' not in description
+
 
 class TestCategoryUrl:
     """Tests for category URL generation."""
@@ -2,13 +2,23 @@
 Tests for db.py - Database operations.
 """
 
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
 import pytest
 from db import (
     get_pageview_bucket,
     get_category,
+    CATEGORY_MAP,
     VALID_STATUSES,
     VALID_COMMONS_STATUSES,
     PAGEVIEW_BUCKETS,
+    BUCKET_ORDER_SQL,
+    mariadb_fulltext_query,
+    TTLCache,
 )
 
 
@@ -56,6 +66,12 @@ class TestGetPageviewBucket:
         idx, label = get_pageview_bucket(None)
         assert label == '<50'
 
+    def test_negative_views(self):
+        assert get_pageview_bucket(-5) == (6, '<50')
+
+    def test_fractional_views(self):
+        assert get_pageview_bucket(999.9)[0] == 2
+
     def test_all_bucket_boundaries(self):
         """Verify every bucket boundary maps to the correct label."""
         expected = [
@@ -90,6 +106,25 @@ class TestGetCategory:
     def test_unknown_defaults_to_profession(self):
         assert get_category('Q999999') == 'profession'
 
+    def test_category_map_compat(self):
+        assert CATEGORY_MAP['Q12737077'] == 'occupation'
+        assert CATEGORY_MAP.get('Q999999') == 'profession'
+
+
+class TestMariadbFulltextQuery:
+    """Tests for the MariaDB boolean-mode search expression."""
+
+    def test_every_word_required_as_prefix(self):
+        assert mariadb_fulltext_query('Soft  eng') == '+Soft* +eng*'
+
+    def test_operators_stripped(self):
+        assert mariadb_fulltext_query('-doctor" @2') is None
+        assert mariadb_fulltext_query('+doctor*') == '+doctor*'
+
+    def test_short_words_fall_back(self):
+        assert mariadb_fulltext_query('IT manager') is None
+        assert mariadb_fulltext_query('') is None
+
 
 class TestDatabaseOperations:
     """Tests for database CRUD operations."""
@@ -114,6 +149,57 @@ class TestDatabaseOperations:
         stats = temp_db.get_stats()
         assert stats['total_careers'] == 3
 
+    def test_batches_split_at_parameter_limit(self, temp_db, sample_careers):
+        with temp_db.get_connection() as conn:
+            conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 12)
+
+        temp_db.upsert_careers(sample_careers)
+        temp_db.update_pageviews_batch([('Q123', 10, 1.0), ('Q456', 20, 2.0), ('Q789', 30, 3.0)])
+        temp_db.add_career_images('Q123', [{'image_url': f'https://example.com/{i}.jpg'} for i in range(3)])
+
+        assert temp_db.get_stats()['total_careers'] == 3
+        assert temp_db.get_career('Q789')['pageviews_total'] == 30
+        assert [image['position'] for image in temp_db.get_career_images('Q123')] == [0, 1, 2]
+
+    def test_upsert_careers_iter_chunks(self, temp_db, sample_careers, monkeypatch):
+        batches = []
+        real_upsert_careers = temp_db.upsert_careers
+        monkeypatch.setattr(temp_db, 'upsert_careers',
+                            lambda careers, rerank=True: batches.append(len(careers))
+                            or real_upsert_careers(careers, rerank))
+
+        temp_db.upsert_careers_iter(iter(sample_careers), chunk_size=2)
+
+        assert batches == [2, 1]
+        assert temp_db.get_stats()['total_careers'] == 3
+
+    def test_upsert_careers_iter_reranks_once(self, temp_db, sample_careers, monkeypatch):
+        refreshes = []
+        real_refresh = temp_db._refresh_ranks
+        monkeypatch.setattr(temp_db, '_refresh_ranks', lambda conn: refreshes.append(1) or real_refresh(conn))
+
+        temp_db.upsert_careers_iter(iter(sample_careers), chunk_size=1)
+
+        assert len(refreshes) == 1
+        assert sorted(c['list_rank'] for c in temp_db.get_all_careers()) == [1, 2, 3]
+
+    def test_add_career_image(self, populated_db):
+        populated_db.add_career_image('Q123', {'image_url': 'https://example.com/a.jpg'})
+
+        images = populated_db.get_career_images('Q123')
+        assert [image['image_url'] for image in images] == ['https://example.com/a.jpg']
+
+    def test_add_career_images_bulk(self, populated_db):
+        populated_db.add_career_images_bulk({
+            'Q123': [{'image_url': 'https://example.com/a.jpg'}, {'image_url': 'https://example.com/b.jpg'}],
+            'Q456': [{'image_url': 'https://example.com/c.jpg', 'source': 'openverse'}],
+        })
+
+        assert [i['position'] for i in populated_db.get_career_images('Q123')] == [0, 1]
+        assert populated_db.get_career_images('Q456')[0]['source'] == 'openverse'
+        assert populated_db.get_career('Q456')['images_fetched_at'] is not None
+        assert populated_db.get_career('Q789')['images_fetched_at'] is None
+
     def test_update_pageviews(self, temp_db, sample_careers):
         temp_db.upsert_career(sample_careers[0])
         temp_db.update_pageviews('Q123', 365000, 1000.0)
@@ -135,6 +221,25 @@ class TestDatabaseOperations:
         assert len(needing) == 2
 
 
+class TestCareerListColumns:
+    """List queries skip the cached lede; the detail view keeps it."""
+
+    def test_lists_omit_lede_text(self, populated_db):
+        populated_db.update_career_lede('Q123', 'A long lede.')
+
+        assert 'lede_text' not in populated_db.get_all_careers()[0]
+        assert 'lede_text' not in populated_db.get_careers_page(0, 10)[0]
+        assert 'lede_text' not in populated_db.search_careers('engineer')[0]
+        assert populated_db.get_career('Q123')['lede_text'] == 'A long lede.'
+
+    def test_lists_keep_other_columns(self, populated_db):
+        career = populated_db.get_top_careers(limit=1)[0]
+        detail = populated_db.get_career(career['wikidata_id'])
+        del detail['lede_text']
+
+        assert {k: career[k] for k in detail} == detail
+
+
 class TestBucketSorting:
     """Tests for bucket-based sorting."""
 
@@ -167,6 +272,74 @@ class TestBucketSorting:
         assert names == ['Accountant', 'Baker', 'Zebra Keeper']
 
 
+class TestIterAllCareers:
+    """Tests for streaming the full career list."""
+
+    def test_small_batches_match_full_list(self, populated_db):
+        streamed = list(populated_db.iter_all_careers(batch=2))
+
+        assert streamed == populated_db.get_all_careers()
+        assert [c['bucket_index'] for c in streamed] == [0, 1, 3]
+
+    def test_sql_buckets_match_python(self, temp_db):
+        views = [2000, 1999.99, 1000, 500, 200, 100, 50, 49.5, 0]
+        temp_db.upsert_careers([
+            {'wikidata_id': f'Q{i}', 'name': f'Career {i}', 'category': 'job'}
+            for i in range(len(views))
+        ])
+        temp_db.update_pageviews_batch([(f'Q{i}', 1, v) for i, v in enumerate(views)])
+
+        for career in temp_db.iter_all_careers():
+            expected = get_pageview_bucket(career['avg_daily_views'])
+            assert (career['bucket_index'], career['bucket_label']) == expected
+
+    def test_queries_allowed_mid_stream(self, populated_db):
+        for career in populated_db.iter_all_careers(batch=1):
+            populated_db.update_career_status(career['wikidata_id'], 'no_picture')
+
+        assert populated_db.get_cached_stats()['by_status'] == {'no_picture': 3}
+
+
+class TestPagination:
+    """Tests for SQL-side pagination."""
+
+    def test_page_matches_full_ordering(self, populated_db):
+        full = [c['wikidata_id'] for c in populated_db.get_all_careers()]
+        page1 = populated_db.get_careers_page(0, 2)
+        page2 = populated_db.get_careers_page(2, 2)
+        assert [c['wikidata_id'] for c in page1 + page2] == full
+
+    def test_page_includes_bucket_label(self, populated_db):
+        page = populated_db.get_careers_page(0, 1)
+        assert page[0]['bucket_label'] == '>2,000'
+
+    def test_page_alphabetical_within_bucket(self, temp_db):
+        temp_db.upsert_careers([
+            {'wikidata_id': 'Q1', 'name': 'zebra keeper', 'category': 'job'},
+            {'wikidata_id': 'Q2', 'name': 'Accountant', 'category': 'profession'},
+            {'wikidata_id': 'Q3', 'name': 'Baker', 'category': 'job'},
+        ])
+        names = [c['name'] for c in temp_db.get_careers_page(0, 10)]
+        assert names == ['Accountant', 'Baker', 'zebra keeper']
+
+    def test_page_filtered_by_status(self, populated_db):
+        populated_db.update_career_status('Q789', 'needs_diverse_images')
+        page = populated_db.get_careers_page(0, 50, status='needs_diverse_images')
+        assert [c['wikidata_id'] for c in page] == ['Q789']
+        assert populated_db.count_careers(status='needs_diverse_images') == 1
+
+    def test_page_filtered_by_search(self, populated_db):
+        page = populated_db.get_careers_page(0, 50, search='doc')
+        assert [c['name'] for c in page] == ['Doctor']
+        assert populated_db.count_careers(search='doc') == 1
+
+    def test_search_wildcards_escaped(self, populated_db):
+        assert populated_db.count_careers(search='%') == 0
+
+    def test_count_all(self, populated_db):
+        assert populated_db.count_careers() == 3
+
+
 class TestStatusOperations:
     """Tests for status updates."""
 
@@ -191,6 +364,24 @@ class TestStatusOperations:
         assert career['reviewed_by'] == 'tester'
         assert career['notes'] == 'Needs more diverse images'
 
+    def test_update_status_stamps_review_time(self, populated_db):
+        populated_db.update_career_status('Q123', 'no_picture')
+
+        career = populated_db.get_career('Q123')
+        assert career['reviewed_at'] == career['updated_at']
+        assert datetime.fromisoformat(career['reviewed_at']).date() == date.today()
+
+    def test_timestamps_share_one_format(self, populated_db):
+        populated_db.update_career_status('Q123', 'no_picture')
+        populated_db.update_pageviews('Q456', 10, 1.0)
+
+        # Same isoformat() shape (6-digit microseconds) as the batch writers,
+        # so string comparisons and sorts across rows stay in time order
+        reviewed = populated_db.get_career('Q123')['updated_at']
+        batched = populated_db.get_career('Q456')['updated_at']
+        assert len(reviewed.split('.')[-1]) == len(batched.split('.')[-1]) == 6
+        assert reviewed < batched
+
     def test_get_careers_by_status(self, populated_db):
         populated_db.update_career_status('Q123', 'needs_diverse_images')
         populated_db.update_career_status('Q456', 'needs_diverse_images')
@@ -258,6 +449,66 @@ class TestSearch:
         results = populated_db.search_careers('D_ctor')
         assert len(results) == 0
 
+    def test_search_word_prefix(self, populated_db):
+        results = populated_db.search_careers('soft eng')
+        assert [c['name'] for c in results] == ['Software Engineer']
+
+    def test_search_ignores_fts_syntax(self, populated_db):
+        assert populated_db.search_careers('doctor"')[0]['name'] == 'Doctor'
+        assert populated_db.search_careers('"*^') == []
+
+    def test_search_sees_renamed_career(self, populated_db):
+        populated_db.upsert_career({'wikidata_id': 'Q456', 'name': 'Physician', 'category': 'profession'})
+        assert populated_db.search_careers('doctor') == []
+        assert populated_db.search_careers('physician')[0]['wikidata_id'] == 'Q456'
+
+    def test_search_rebuilds_index_for_existing_rows(self, populated_db):
+        # Simulate a migration that rebuilt the careers table and dropped the triggers
+        with populated_db.get_connection() as conn:
+            conn.execute("DROP TRIGGER careers_fts_ai")
+            conn.execute("DELETE FROM careers_fts")
+            conn.commit()
+        populated_db.init_schema()
+        assert populated_db.search_careers('teacher')[0]['wikidata_id'] == 'Q789'
+
+    def test_search_uses_fts_index(self, populated_db):
+        with populated_db.get_connection() as conn:
+            clause, param = populated_db._search_clause(conn, 'eng')
+            plan = [row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM careers WHERE {clause}", (param,))]
+        assert any('careers_fts VIRTUAL TABLE' in step for step in plan)
+        assert 'SCAN careers' not in plan
+
+    def test_search_by_wikidata_id(self, populated_db):
+        assert [c['name'] for c in populated_db.search_careers('q456')] == ['Doctor']
+        assert populated_db.count_careers(search='Q789') == 1
+        assert populated_db.search_careers('Q4') == []
+        with populated_db.get_connection() as conn:
+            clause, param = populated_db._search_clause(conn, 'Q456')
+            plan = [row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM careers WHERE {clause}", (param,))]
+        assert plan == ['SEARCH careers USING INDEX sqlite_autoindex_careers_1 (wikidata_id=?)']
+
+    def test_search_non_ascii_digits_not_treated_as_wikidata_id(self, populated_db):
+        with populated_db.get_connection() as conn:
+            clause, _ = populated_db._search_clause(conn, 'Q\u0664\u0662')
+        assert 'wikidata_id' not in clause
+
+    def test_search_falls_back_to_like(self, populated_db):
+        populated_db._fts_enabled = False
+        results = populated_db.search_careers('ngineer')
+        assert [c['name'] for c in results] == ['Software Engineer']
+
+    def test_like_fallback_escapes_wildcards(self, populated_db):
+        populated_db._fts_enabled = False
+        assert populated_db.search_careers('%') == []
+        assert populated_db.search_careers('D_ctor') == []
+        assert populated_db.search_careers('\\') == []
+
+    def test_get_career_by_name_case_insensitive(self, populated_db):
+        assert populated_db.get_career_by_name('DOCTOR')['wikidata_id'] == 'Q456'
+        assert populated_db.get_career_by_name('Doc') is None
+
 
 class TestCommonsOperations:
     """Tests for Commons category operations."""
@@ -387,3 +638,318 @@ class TestReplacementImageMetadata:
 
         images = populated_db.get_career_images('Q123')
         assert images[0]['metadata'] is None
+
+    def test_init_schema_adds_metadata_to_old_table(self, temp_db):
+        with temp_db.get_connection() as conn:
+            conn.execute("ALTER TABLE career_images DROP COLUMN metadata")
+            conn.commit()
+
+        temp_db.init_schema()
+
+        with temp_db.get_connection() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(career_images)")}
+        assert 'metadata' in columns
+
+
+class TestAdjacentCareers:
+    """Tests for prev/next navigation queries."""
+
+    def test_next_and_prev_follow_bucket_order(self, populated_db):
+        # Order: Doctor (Q456), Software Engineer (Q123), Teacher (Q789)
+        assert populated_db.get_next_career('Q456')['wikidata_id'] == 'Q123'
+        assert populated_db.get_next_career('Q123')['wikidata_id'] == 'Q789'
+        assert populated_db.get_prev_career('Q789')['wikidata_id'] == 'Q123'
+        assert populated_db.get_prev_career('Q123')['wikidata_id'] == 'Q456'
+
+    def test_ends_of_list(self, populated_db):
+        assert populated_db.get_prev_career('Q456') is None
+        assert populated_db.get_next_career('Q789') is None
+
+    def test_unknown_career(self, populated_db):
+        assert populated_db.get_next_career('Q999999') is None
+
+    def test_commons_only_skips_careers_without_category(self, populated_db):
+        populated_db.upsert_career({
+            'wikidata_id': 'Q789', 'name': 'Teacher', 'category': 'occupation',
+            'commons_category': 'Teachers',
+        })
+        populated_db.upsert_career({
+            'wikidata_id': 'Q456', 'name': 'Doctor', 'category': 'profession',
+            'commons_category': 'Physicians',
+        })
+        assert populated_db.get_next_career('Q456', commons_only=True)['wikidata_id'] == 'Q789'
+        assert populated_db.get_prev_career('Q789', commons_only=True)['wikidata_id'] == 'Q456'
+
+
+class TestListRank:
+    """Tests for the precomputed careers.list_rank column."""
+
+    def test_ranks_follow_bucket_order(self, populated_db):
+        ranks = {c['wikidata_id']: c['list_rank'] for c in populated_db.get_all_careers()}
+        assert ranks == {'Q456': 1, 'Q123': 2, 'Q789': 3}
+
+    def test_pageview_update_reranks(self, populated_db):
+        populated_db.update_pageviews_batch([('Q789', 3650000, 10000.0)])
+        # Teacher joins Doctor's bucket and sorts after it alphabetically
+        assert populated_db.get_career('Q789')['list_rank'] == 2
+        assert populated_db.get_career('Q123')['list_rank'] == 3
+
+    def test_new_career_ranked(self, populated_db):
+        populated_db.upsert_career({'wikidata_id': 'Q1', 'name': 'Actor', 'category': 'profession'})
+        # No pageviews yet: lowest bucket, so last
+        assert populated_db.get_career('Q1')['list_rank'] == 4
+        populated_db.update_pageviews('Q1', 365000, 1000.0)
+        # Same bucket as Software Engineer, alphabetically first
+        assert populated_db.get_career('Q1')['list_rank'] == 2
+        assert populated_db.get_career('Q123')['list_rank'] == 3
+
+    def test_unmoved_rows_skip_rerank(self, populated_db, monkeypatch):
+        refreshes = []
+        real_refresh = populated_db._refresh_ranks
+        monkeypatch.setattr(populated_db, '_refresh_ranks', lambda conn: refreshes.append(1) or real_refresh(conn))
+
+        # Same bucket (1,000-2,000) and same name: list order can't change
+        populated_db.update_pageviews('Q123', 400000, 1100.0)
+        populated_db.upsert_career({'wikidata_id': 'Q123', 'name': 'Software Engineer', 'category': 'job'})
+        assert refreshes == []
+
+        populated_db.update_pageviews('Q123', 10, 0.1)
+        assert refreshes == [1]
+        assert populated_db.get_career('Q123')['list_rank'] == 3
+
+    def test_limited_lists_take_first_ranks(self, populated_db):
+        populated_db.upsert_career({'wikidata_id': 'Q1', 'name': 'Actor', 'category': 'profession'})
+        populated_db.update_pageviews('Q1', 365000, 1000.0)
+
+        careers = populated_db.get_careers_by_status('unreviewed', limit=2)
+
+        assert [c['wikidata_id'] for c in careers] == ['Q456', 'Q1']
+        assert [c['bucket_index'] for c in careers] == [0, 1]
+
+    def test_status_list_walks_index_without_sorting(self, populated_db):
+        with populated_db.get_connection() as conn:
+            plan = [row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM careers WHERE status = ? ORDER BY list_rank LIMIT 10",
+                ('unreviewed',))]
+        assert any('idx_status_rank' in step for step in plan)
+        assert not any('TEMP B-TREE' in step for step in plan)
+
+    def test_rank_refresh_walks_expression_index(self, populated_db):
+        with populated_db.get_connection() as conn:
+            plan = [row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT wikidata_id, ROW_NUMBER() OVER (ORDER BY {BUCKET_ORDER_SQL}) FROM careers")]
+        assert any('idx_careers_list_order' in step for step in plan)
+        assert not any('TEMP B-TREE' in step for step in plan)
+
+    def test_init_schema_backfills_missing_ranks(self, populated_db):
+        with populated_db.get_connection() as conn:
+            conn.execute("UPDATE careers SET list_rank = NULL")
+            conn.commit()
+        populated_db.init_schema()
+        assert populated_db.get_career('Q123')['list_rank'] == 2
+
+
+class TestGetStats:
+    """Tests for the dataset statistics."""
+
+    def test_aggregates(self, populated_db):
+        populated_db.upsert_career({'wikidata_id': 'Q1', 'name': 'Actor', 'category': 'profession'})
+        populated_db.update_career_status('Q456', 'needs_diverse_images')
+
+        stats = populated_db.get_stats()
+
+        assert stats['total_careers'] == 4
+        assert stats['with_pageviews'] == 3
+        assert stats['total_views'] == 365000 + 1825000 + 73000
+        assert stats['by_category'] == {'profession': 3, 'occupation': 1}
+        assert stats['by_status'] == {'unreviewed': 3, 'needs_diverse_images': 1}
+        assert stats['top_career'] == {'name': 'Doctor', 'views': 1825000}
+
+    def test_empty(self, temp_db):
+        stats = temp_db.get_stats()
+        assert stats['total_careers'] == 0
+        assert stats['total_views'] == 0
+        assert 'top_career' not in stats
+
+
+class TestStatsCache:
+    """Tests for the in-process get_stats() cache."""
+
+    def test_cached_stats_reused_until_invalidated(self, populated_db):
+        assert populated_db.get_cached_stats()['total_careers'] == 3
+
+        # A write that bypasses the db methods is not seen until invalidation
+        with populated_db.get_connection() as conn:
+            conn.execute("DELETE FROM careers WHERE wikidata_id = 'Q789'")
+            conn.commit()
+        assert populated_db.get_cached_stats()['total_careers'] == 3
+
+        populated_db.invalidate_stats()
+        assert populated_db.get_cached_stats()['total_careers'] == 2
+
+    def test_status_update_invalidates(self, populated_db):
+        populated_db.get_cached_stats()
+        populated_db.update_career_status('Q123', 'needs_diverse_images')
+        stats = populated_db.get_cached_stats()
+        assert stats['by_status']['needs_diverse_images'] == 1
+
+    def test_expired_entry_reloaded(self, populated_db):
+        populated_db._cache.ttl = 0
+        populated_db.get_cached_stats()
+        with populated_db.get_connection() as conn:
+            conn.execute("DELETE FROM careers WHERE wikidata_id = 'Q789'")
+            conn.commit()
+        assert populated_db.get_cached_stats()['total_careers'] == 2
+
+    def test_concurrent_misses_load_once(self):
+        cache = TTLCache(ttl=30)
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(timeout=5)
+            return 'stats'
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(cache.get, 'stats', loader) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            assert [f.result() for f in futures] == ['stats'] * 4
+        assert len(calls) == 1
+
+    def test_clear_during_load_discards_result(self):
+        cache = TTLCache(ttl=30)
+
+        def stale_loader():
+            cache.clear()  # A write lands while the load is running
+            return 'stale'
+
+        assert cache.get('stats', stale_loader) == 'stale'
+        assert cache.get('stats', lambda: 'fresh') == 'fresh'
+
+
+class TestRandomCareer:
+    """Tests for picking a random career by status."""
+
+    def test_returns_career_with_status(self, populated_db):
+        populated_db.update_career_status('Q456', 'has_diverse_images')
+        populated_db.update_career_status('Q789', 'has_diverse_images')
+        career = populated_db.get_random_career_by_status('unreviewed')
+        assert career == {'wikidata_id': 'Q123', 'name': 'Software Engineer'}
+
+    def test_pool_limits_to_most_viewed(self, populated_db):
+        for _ in range(10):
+            career = populated_db.get_random_career_by_status('unreviewed', pool=1)
+            assert career['wikidata_id'] == 'Q456'
+
+    def test_none_when_no_match(self, populated_db):
+        assert populated_db.get_random_career_by_status('gender_specific') is None
+
+
+class TestNextUnreviewed:
+    """Tests for walking the unreviewed queue by pageviews."""
+
+    def test_starts_at_most_viewed(self, populated_db):
+        assert populated_db.get_next_unreviewed()['wikidata_id'] == 'Q456'
+
+    def test_continues_after_current(self, populated_db):
+        assert populated_db.get_next_unreviewed('Q456')['wikidata_id'] == 'Q123'
+        assert populated_db.get_next_unreviewed('Q123')['wikidata_id'] == 'Q789'
+
+    def test_skips_reviewed(self, populated_db):
+        populated_db.update_career_status('Q123', 'has_diverse_images')
+        assert populated_db.get_next_unreviewed('Q456')['wikidata_id'] == 'Q789'
+
+    def test_wraps_to_top(self, populated_db):
+        assert populated_db.get_next_unreviewed('Q789')['wikidata_id'] == 'Q456'
+
+    def test_none_when_queue_empty(self, populated_db):
+        for qid in ('Q123', 'Q456', 'Q789'):
+            populated_db.update_career_status(qid, 'no_picture')
+        assert populated_db.get_next_unreviewed('Q123') is None
+
+
+class TestSQLiteConnection:
+    """Tests for per-connection SQLite settings."""
+
+    def test_wal_mode_enabled(self, temp_db):
+        with temp_db.get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    def test_synchronous_normal(self, temp_db):
+        with temp_db.get_connection() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_rows_are_plain_tuples(self, populated_db):
+        with populated_db.get_connection() as conn:
+            row = conn.execute("SELECT wikidata_id, name FROM careers WHERE wikidata_id = 'Q123'").fetchone()
+        assert row == ('Q123', 'Software Engineer')
+        assert populated_db.get_career('Q123')['name'] == 'Software Engineer'
+        assert populated_db.get_career('Q000') is None
+
+    def test_new_database_uses_incremental_vacuum(self, temp_db):
+        with temp_db.get_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_maintenance_converts_and_analyzes(self, populated_db):
+        with populated_db.get_connection() as conn:
+            conn.execute("PRAGMA auto_vacuum = NONE")
+            conn.execute("VACUUM")
+
+        populated_db.maintenance()
+
+        with populated_db.get_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        assert populated_db.get_career('Q123')['name'] == 'Software Engineer'
+
+    def test_connection_reused_within_thread(self, temp_db):
+        with temp_db.get_connection() as first:
+            pass
+        with temp_db.get_connection() as second:
+            pass
+        assert first is second
+
+    def test_threads_get_own_connections(self, temp_db):
+        with temp_db.get_connection() as main_conn:
+            pass
+
+        def thread_connection():
+            with temp_db.get_connection() as conn:
+                return conn
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(thread_connection).result() is not main_conn
+
+    def test_close_drops_connection(self, temp_db):
+        with temp_db.get_connection() as first:
+            pass
+        temp_db.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+        with temp_db.get_connection() as second:
+            assert second is not first
+            assert second.execute("SELECT COUNT(*) FROM careers").fetchone()[0] == 0
+
+    def test_uncommitted_work_rolled_back(self, temp_db):
+        with temp_db.get_connection() as conn:
+            conn.execute("INSERT INTO careers (wikidata_id, name) VALUES ('Q1', 'Pending')")
+        assert temp_db.get_career('Q1') is None
+
+    def test_nested_use_keeps_transaction(self, temp_db):
+        with temp_db.get_connection() as outer:
+            outer.execute("INSERT INTO careers (wikidata_id, name) VALUES ('Q1', 'Nested')")
+            with temp_db.get_connection() as inner:
+                assert inner is outer
+            assert outer.in_transaction
+            outer.commit()
+        assert temp_db.get_career('Q1')['name'] == 'Nested'
+
+    def test_foreign_keys_enforced(self, temp_db):
+        with temp_db.get_connection() as conn:
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute(
+                    "INSERT INTO career_images (wikidata_id, image_url) VALUES ('Q0', 'x')"
+                )
@@ -0,0 +1,203 @@
+"""
+Tests for wikipedia.py - Wikipedia API helpers.
+"""
+
+import os
+import threading
+import time
+import pytest
+import responses
+import wikipedia
+from wikipedia import (
+    extract_title_from_url,
+    fetch_career_data,
+    invalidate_career_data,
+)
+
+
+API_URL = 'https://en.wikipedia.org/w/api.php'
+ARTICLE_URL = 'https://en.wikipedia.org/wiki/Nurse'
+
+CONTENT_RESPONSE = {
+    'query': {
+        'pages': {
+            '1': {
+                'title': 'Nurse',
+                'extract': 'A nurse is a health care professional.',
+                'thumbnail': {'source': 'https://upload.wikimedia.org/nurse.jpg'},
+            }
+        }
+    }
+}
+
+NO_IMAGES_RESPONSE = {'query': {'pages': {'1': {'title': 'Nurse'}}}}
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Retry failed requests immediately."""
+    monkeypatch.setattr(wikipedia.SESSION.get_adapter(API_URL).max_retries, 'backoff_factor', 0)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the career data cache at a per-test directory."""
+    monkeypatch.setattr(wikipedia, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def add_article_responses():
+    responses.add(responses.GET, API_URL, json=CONTENT_RESPONSE, status=200)
+    responses.add(responses.GET, API_URL, json=NO_IMAGES_RESPONSE, status=200)
+
+
+class TestExtractTitleFromUrl:
+    """Tests for Wikipedia URL parsing."""
+
+    def test_decodes_title(self):
+        assert extract_title_from_url('https://en.wikipedia.org/wiki/Fire_fighter%27s') == "Fire fighter's"
+
+    def test_non_wiki_url(self):
+        assert extract_title_from_url('https://example.com/') == ''
+
+
+class TestFetchCareerDataCache:
+    """Tests for the on-disk fetch_career_data cache."""
+
+    @responses.activate
+    def test_second_call_served_from_cache(self):
+        add_article_responses()
+
+        first = fetch_career_data(ARTICLE_URL)
+        second = fetch_career_data(ARTICLE_URL)
+
+        assert first == second
+        assert second['lede'] == 'A nurse is a health care professional.'
+        assert len(responses.calls) == 2  # content + images, once
+
+    @responses.activate
+    def test_use_cache_false_refetches(self):
+        add_article_responses()
+        add_article_responses()
+
+        fetch_career_data(ARTICLE_URL)
+        fetch_career_data(ARTICLE_URL, use_cache=False)
+
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_expired_entry_refetched(self, monkeypatch):
+        add_article_responses()
+        add_article_responses()
+        monkeypatch.setattr(wikipedia, 'CACHE_TTL', -1)
+
+        fetch_career_data(ARTICLE_URL)
+        fetch_career_data(ARTICLE_URL)
+
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_invalidate_forces_refetch(self):
+        add_article_responses()
+        add_article_responses()
+
+        fetch_career_data(ARTICLE_URL)
+        invalidate_career_data(ARTICLE_URL)
+        fetch_career_data(ARTICLE_URL)
+
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_errors_not_cached(self, cache_dir):
+        # Initial attempt plus every retry fails
+        for _ in range(4):
+            responses.add(responses.GET, API_URL, status=500)
+        responses.add(responses.GET, API_URL, json=NO_IMAGES_RESPONSE, status=200)
+
+        data = fetch_career_data(ARTICLE_URL)
+
+        assert data['lede'] == ''
+        assert os.listdir(cache_dir) == []
+
+    @responses.activate
+    def test_image_errors_not_cached(self, cache_dir):
+        responses.add(responses.GET, API_URL, json=CONTENT_RESPONSE, status=200)
+        # Initial attempt plus every retry of the prop=images query fails
+        for _ in range(4):
+            responses.add(responses.GET, API_URL, status=500)
+
+        data = fetch_career_data(ARTICLE_URL)
+
+        assert data['lede'] == 'A nurse is a health care professional.'
+        assert data['images'] == []
+        assert 'prop=images' in responses.calls[-1].request.url
+        assert os.listdir(cache_dir) == []
+
+
+class TestConcurrentFetches:
+    """Tests for sharing in-progress fetches between threads."""
+
+    def test_same_article_fetched_once(self, monkeypatch):
+        release = threading.Event()
+        calls = []
+
+        def slow_content(title):
+            calls.append(title)
+            release.wait(5)
+            return {'title': title, 'lede': 'Lede', 'thumbnail_url': None}
+
+        monkeypatch.setattr(wikipedia, 'fetch_article_content', slow_content)
+        monkeypatch.setattr(wikipedia, 'fetch_article_images', lambda title: [])
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            fetch_career_data(ARTICLE_URL, use_cache=False))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while not wikipedia._IN_FLIGHT:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [r['lede'] for r in results] == ['Lede'] * 3
+        assert wikipedia._IN_FLIGHT == {}
+
+    def test_other_articles_not_blocked(self, monkeypatch):
+        release = threading.Event()
+
+        def content(title):
+            if title == 'Nurse':
+                release.wait(5)
+            return {'title': title, 'lede': title, 'thumbnail_url': None}
+
+        monkeypatch.setattr(wikipedia, 'fetch_article_content', content)
+        monkeypatch.setattr(wikipedia, 'fetch_article_images', lambda title: [])
+
+        slow = threading.Thread(target=fetch_career_data, args=(ARTICLE_URL,))
+        slow.start()
+        try:
+            while ARTICLE_URL not in wikipedia._IN_FLIGHT:
+                time.sleep(0.001)
+            assert fetch_career_data('https://en.wikipedia.org/wiki/Welder')['lede'] == 'Welder'
+        finally:
+            release.set()
+            slow.join()
+
+
+class TestSession:
+    """Tests for the shared HTTP session."""
+
+    @responses.activate
+    def test_transient_error_retried(self):
+        responses.add(responses.GET, API_URL, status=503)
+        add_article_responses()
+
+        data = fetch_career_data(ARTICLE_URL)
+
+        assert data['lede'] == 'A nurse is a health care professional.'
+        assert len(responses.calls) == 3
+
+    def test_invalidate_missing_entry_is_noop(self):
+        invalidate_career_data('https://en.wikipedia.org/wiki/Nothing')
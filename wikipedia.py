@@ -2,8 +2,20 @@
 wikipedia.py - Fetch article content and images from Wikipedia API
 """
 
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import unquote
+from urllib3.util.retry import Retry
+
+import disk_cache
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
 
 # Filter out these common template/icon images
 IGNORED_IMAGE_PREFIXES = (
@@ -42,6 +54,28 @@ HEADERS = {
     'User-Agent': 'WikipediaCareerDiversityTool/1.0 (https://github.com/tieguy/wikipedia-career-images)'
 }
 
+# One pooled keep-alive session for every Wikipedia API call; the three
+# requests per article view reuse the same TLS connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False),
+))
+
+# On-disk cache for fetch_career_data(), shared by all worker processes so
+# repeat views of a career skip the two Wikipedia API round-trips
+CACHE_DIR = os.environ.get('WIKI_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'career-images-wiki'))
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Fetches in progress in this process, by URL: a concurrent request for the
+# same article (e.g. a background prefetch and the reviewer's click) waits on
+# the running fetch instead of repeating its API calls, while fetches of
+# different articles never wait on each other
+_IN_FLIGHT: dict[str, Future] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
 
 def extract_title_from_url(url: str) -> str:
     """Extract article title from Wikipedia URL"""
@@ -76,7 +110,7 @@ def fetch_article_content(title: str) -> dict:
     }
 
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
     except requests.RequestException as e:
@@ -96,11 +130,11 @@ def fetch_article_content(title: str) -> dict:
     return {'title': title, 'lede': '', 'thumbnail_url': None}
 
 
-def fetch_article_images(title: str) -> list[dict]:
+def fetch_article_images(title: str) -> list[dict] | None:
     """
     Fetch all images from an article with their URLs and captions.
 
-    Returns list of:
+    Returns None if a request failed (as opposed to [] for no images), else a list of:
         {
             'image_url': str,
             'thumb_url': str,
@@ -120,11 +154,11 @@ def fetch_article_images(title: str) -> list[dict]:
     }
 
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
     except requests.RequestException:
-        return []
+        return None
 
     # Extract image titles, filtering out templates
     image_titles = []
@@ -151,11 +185,11 @@ def fetch_article_images(title: str) -> list[dict]:
     }
 
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
     except requests.RequestException:
-        return []
+        return None
 
     images = []
     pages = data.get('query', {}).get('pages', {})
@@ -169,8 +203,7 @@ def fetch_article_images(title: str) -> list[dict]:
             caption = metadata.get('ImageDescription', {}).get('value', '')
             # Clean up HTML from caption
             if caption:
-                import re
-                caption = re.sub(r'<[^>]+>', '', caption)
+                caption = _HTML_TAG_RE.sub('', caption[:4000])
                 caption = caption[:500]  # Truncate long captions
 
             images.append({
@@ -183,10 +216,18 @@ def fetch_article_images(title: str) -> list[dict]:
     return images
 
 
-def fetch_career_data(wikipedia_url: str) -> dict:
+def invalidate_career_data(wikipedia_url: str):
+    """Drop the cached data for a career so the next view refetches it"""
+    disk_cache.delete(CACHE_DIR, wikipedia_url)
+
+
+def fetch_career_data(wikipedia_url: str, use_cache: bool = True) -> dict:
     """
     Fetch all data needed for reviewing a career.
 
+    Results are cached on disk for CACHE_TTL seconds; pass use_cache=False
+    to force a fresh fetch (the result still refreshes the cache).
+
     Returns:
         {
             'title': str,
@@ -199,15 +240,43 @@ def fetch_career_data(wikipedia_url: str) -> dict:
     if not title:
         return {'title': '', 'lede': '', 'thumbnail_url': None, 'images': []}
 
-    content = fetch_article_content(title)
-    images = fetch_article_images(title)
+    if use_cache:
+        cached = disk_cache.read(CACHE_DIR, wikipedia_url, CACHE_TTL)
+        if cached is not None:
+            return cached
 
-    return {
-        'title': content['title'],
-        'lede': content['lede'],
-        'thumbnail_url': content['thumbnail_url'],
-        'images': images,
-    }
+    with _IN_FLIGHT_LOCK:
+        future = _IN_FLIGHT.get(wikipedia_url)
+        running = future is not None
+        if not running:
+            future = _IN_FLIGHT[wikipedia_url] = Future()
+    if running:
+        return future.result()
+
+    try:
+        content = fetch_article_content(title)
+        images = fetch_article_images(title)
+
+        data = {
+            'title': content['title'],
+            'lede': content['lede'],
+            'thumbnail_url': content['thumbnail_url'],
+            'images': images or [],
+        }
+
+        # Don't cache a failed fetch - it would hide the article or its images for a day
+        if 'error' not in content and images is not None:
+            disk_cache.write(CACHE_DIR, wikipedia_url, data)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(data)
+    finally:
+        with _IN_FLIGHT_LOCK:
+            del _IN_FLIGHT[wikipedia_url]
+
+    return data
 
 
 if __name__ == '__main__':